@@ -1,11 +1,21 @@
 import yaml
 import logging
+import os
+import pickle
+import sys
+import tempfile
 import time
 from atlassian import Bitbucket
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter
 from requests.exceptions import RequestException
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # === Logging Configuration ===
 logging.basicConfig(
     level=logging.DEBUG,
@@ -22,11 +32,28 @@ RETRY_COUNT = 3
 RETRY_DELAY = 5  # seconds
 
 def load_config(file_path='config.yaml'):
-    with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+    """Load config YAML, reusing a pickle sidecar while the source is unchanged."""
+    cache = file_path + '.pkl'
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(file_path):
+            with open(cache, 'rb') as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
 
-def is_within_range(date_obj, start, end):
-    return start <= date_obj <= end
+    with open(file_path, 'r') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+
+    tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(cache)), delete=False)
+    try:
+        pickle.dump(config, tmp)
+        tmp.close()
+        os.replace(tmp.name, cache)
+    except OSError:
+        tmp.close()
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+    return config
 
 def safe_api_call(func, *args, **kwargs):
     """Retry wrapper for API calls."""
@@ -60,47 +87,72 @@ def main():
     )
 
     project_key = config['project']
+    page_size = config['bitbucket'].get('page_size', 1000)
     users = set(config['users'])
     start_date = datetime.strptime(config['date_range']['start'], '%Y-%m-%d')
     end_date = datetime.strptime(config['date_range']['end'], '%Y-%m-%d')
+    start_ms = int(start_date.timestamp() * 1000)
+    # end date is inclusive: cover the whole final day
+    end_ms = int(end_date.timestamp() * 1000) + 86_400_000
 
-    submitted_count = defaultdict(int)
-    reviewed_count = defaultdict(int)
+    submitted_count = Counter()
+    reviewed_count = Counter()
 
-    repos = safe_api_call(bitbucket.get_repos, project_key)
+    repos = safe_api_call(bitbucket.get_repos, project_key, limit=page_size)
     if not repos:
         logging.error("No repositories found or failed to fetch.")
         return
 
-    for repo in repos:
-        slug = repo['slug']
+    def scan_repo(slug):
+        """Scan one repository's pull requests; returns per-repo counters."""
+        submitted = Counter()
+        reviewed = Counter()
+        _users = users  # local binding for the per-PR membership tests
         logging.info(f"Scanning repository: {slug}")
         start = 0
-        limit = 50
+        limit = page_size
 
+        done = False
         while True:
             prs = safe_api_call(bitbucket.get_pull_requests, project_key, slug, state='ALL', start=start, limit=limit)
             if not prs:
                 break
 
             for pr in prs:
-                created_ts = pr['createdDate'] // 1000
-                created_date = datetime.fromtimestamp(created_ts)
                 author = pr['author']['user']['name']
 
-                if is_within_range(created_date, start_date, end_date) and author in users:
-                    submitted_count[author] += 1
+                # cheap set test first so untracked authors skip the range check
+                if author in _users and start_ms <= pr['createdDate'] < end_ms:
+                    submitted[author] += 1
 
-                for reviewer in pr.get('reviewers', []):
+                for reviewer in (pr.get('reviewers') or ()):
                     reviewer_name = reviewer['user']['name']
-                    if reviewer_name in users:
-                        reviewed_count[reviewer_name] += 1
+                    if reviewer_name in _users:
+                        reviewed[reviewer_name] += 1
+
+                # pages arrive newest-first: nothing after this PR can be in range
+                if pr['createdDate'] < start_ms:
+                    done = True
 
+            if done:
+                break
             start += limit
 
-    print("\nPull Request Summary:")
-    for user in users:
-        print(f"{user}: Submitted={submitted_count[user]}, Reviewed={reviewed_count[user]}")
+        return submitted, reviewed
+
+    # repos are independent; overlap their page fetches so we are not
+    # serialized on one round trip at a time
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for submitted, reviewed in executor.map(scan_repo, (repo['slug'] for repo in repos)):
+            submitted_count.update(submitted)
+            reviewed_count.update(reviewed)
+
+    # one write for the whole report instead of a syscall per user
+    sys.stdout.write(
+        "\nPull Request Summary:\n"
+        + "\n".join(f"{user}: Submitted={submitted_count[user]}, Reviewed={reviewed_count[user]}" for user in users)
+        + "\n"
+    )
 
 if __name__ == "__main__":
     main()
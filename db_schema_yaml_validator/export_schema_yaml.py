@@ -2,151 +2,189 @@ import argparse
 import os
 import yaml
 import hashlib
+from collections import defaultdict
 from sqlalchemy import create_engine
 from utils_sql import *
+from yaml_io import SafeDumper, load_yaml_cached
+
+# bump when the snapshot format changes (2: definition_hash switched to blake2b-128)
+SNAPSHOT_VERSION = 2
 
 def norm(s: str) -> str:
     if s is None:
         return ""
     return " ".join(s.split())
 
-def export_snapshot(engine, include_schemas, exclude_schemas, table_like):
-    snap = {
-        "tables": [],
-        "views": [],
-        "functions": [],
-        "roles": [],
-        "role_memberships": [],
-        "sequences": [],
-        "sequence_ownerships": []
-    }
+def definition_hash(definition):
+    # blake2b beats sha256 in software and 128 bits is plenty for change detection
+    return hashlib.blake2b(norm(definition).encode("utf-8"), digest_size=16).hexdigest()
+
+def emit_section(out, key, entries):
+    """Write one top-level snapshot section, one entry at a time.
+
+    Dumping each entry as a one-element list produces the same bytes as
+    dumping the whole section in one go, but only one entry dict is alive
+    at a time.
+    """
+    wrote = False
+    for entry in entries:
+        if not wrote:
+            out.write(f"{key}:\n")
+            wrote = True
+        yaml.dump([entry], out, Dumper=SafeDumper, sort_keys=False)
+    if not wrote:
+        yaml.dump({key: []}, out, Dumper=SafeDumper, sort_keys=False)
+
+def export_snapshot(engine, include_schemas, exclude_schemas, table_like, out):
     with engine.connect() as conn:
-        # roles
-        for r in conn.execute(SQL_ROLES):
-            snap["roles"].append({
-                "name": r.rolname,
-                "can_login": bool(r.rolcanlogin),
-                "superuser": bool(r.rolsuper),
-                "inherit": bool(r.rolinherit),
-                "createrole": bool(r.rolcreaterole),
-                "createdb": bool(r.rolcreatedb),
-                "replication": bool(r.rolreplication),
-            })
-        for m in conn.execute(SQL_ROLE_MEMBERS):
-            snap["role_memberships"].append({"role": m.role, "member": m.member})
-
-        # tables & columns
-        tables = conn.execute(SQL_LIST_TABLES, {
+        # read rows in chunks from a server-side cursor instead of one big fetch
+        conn = conn.execution_options(stream_results=True, yield_per=1000)
+        yaml.dump({"version": SNAPSHOT_VERSION}, out, Dumper=SafeDumper, sort_keys=False)
+
+        schema_params = {
             "include_schemas": include_schemas,
-            "exclude_schemas": tuple(exclude_schemas),
-            "table_like": table_like
-        }).all()
-
-        for t in tables:
-            schema, name = t.table_schema, t.table_name
-            entry = {"schema": schema, "name": name, "columns": []}
-
-            cols = conn.execute(SQL_LIST_COLUMNS, {"schema": schema, "table": name}).all()
-            for c in cols:
-                entry["columns"].append({
-                    "name": c.column_name,
-                    "data_type": c.udt_name or c.data_type or "",
-                    "is_nullable": (c.is_nullable or ""),
-                    "char_max": c.character_maximum_length,
-                    "num_precision": c.numeric_precision,
-                    "num_scale": c.numeric_scale,
-                    "datetime_precision": c.datetime_precision,
-                    "default": c.column_default,
-                    "is_identity": (c.is_identity or ""),
-                })
-
-            # PK
-            pk = conn.execute(SQL_PK, {"schema": schema, "table": name}).all()
-            if pk:
-                entry["primary_key"] = {"name": pk[0].constraint_name, "columns": list(pk[0].columns)}
-
-            # uniques
-            uqs = conn.execute(SQL_UNIQUES, {"schema": schema, "table": name}).all()
-            if uqs:
-                entry["uniques"] = [{"name": u.constraint_name, "columns": list(u.columns)} for u in uqs]
-
-            # fks
-            fk_rows = conn.execute(SQL_FKS, {"schema": schema, "table": name}).all()
-            if fk_rows:
-                grouped = {}
-                for r in fk_rows:
-                    grouped.setdefault(r.constraint_name, []).append(r)
-                fks = []
-                for cname, rows in grouped.items():
-                    rows = sorted(rows, key=lambda x: x.ordinal_position or 0)
-                    fks.append({
-                        "name": cname,
-                        "ref_schema": rows[0].foreign_table_schema,
-                        "ref_table": rows[0].foreign_table_name,
-                        "columns": [{"local": r.column_name, "remote": r.foreign_column_name} for r in rows]
+            "exclude_schemas": tuple(exclude_schemas)
+        }
+        table_params = dict(schema_params, table_like=table_like)
+
+        # one round trip per metadata kind instead of four per table
+        cols_by_tbl = defaultdict(list)
+        for c in conn.execute(SQL_LIST_COLUMNS_BULK, table_params):
+            cols_by_tbl[(c.table_schema, c.table_name)].append(c)
+        pk_by_tbl = {}
+        for p in conn.execute(SQL_PK_BULK, table_params):
+            pk_by_tbl[(p.table_schema, p.table_name)] = p
+        uqs_by_tbl = defaultdict(list)
+        for u in conn.execute(SQL_UNIQUES_BULK, table_params):
+            uqs_by_tbl[(u.table_schema, u.table_name)].append(u)
+        fks_by_tbl = defaultdict(list)
+        for r in conn.execute(SQL_FKS_BULK, table_params):
+            fks_by_tbl[(r.table_schema, r.table_name)].append(r)
+
+        def table_entries():
+            for t in conn.execute(SQL_LIST_TABLES, table_params):
+                schema, name = t.table_schema, t.table_name
+                entry = {"schema": schema, "name": name, "columns": []}
+
+                for c in cols_by_tbl.get((schema, name), []):
+                    entry["columns"].append({
+                        "name": c.column_name,
+                        "data_type": c.udt_name or c.data_type or "",
+                        "is_nullable": (c.is_nullable or ""),
+                        "char_max": c.character_maximum_length,
+                        "num_precision": c.numeric_precision,
+                        "num_scale": c.numeric_scale,
+                        "datetime_precision": c.datetime_precision,
+                        "default": c.column_default,
+                        "is_identity": (c.is_identity or ""),
                     })
-                entry["foreign_keys"] = fks
 
-            snap["tables"].append(entry)
+                # PK
+                pk = pk_by_tbl.get((schema, name))
+                if pk is not None:
+                    entry["primary_key"] = {"name": pk.constraint_name, "columns": list(pk.columns)}
+
+                # uniques
+                uqs = uqs_by_tbl.get((schema, name), [])
+                if uqs:
+                    entry["uniques"] = [{"name": u.constraint_name, "columns": list(u.columns)} for u in uqs]
+
+                # fks
+                fk_rows = fks_by_tbl.get((schema, name), [])
+                if fk_rows:
+                    grouped = {}
+                    for r in fk_rows:
+                        grouped.setdefault(r.constraint_name, []).append(r)
+                    fks = []
+                    for cname, rows in grouped.items():
+                        rows = sorted(rows, key=lambda x: x.ordinal_position or 0)
+                        fks.append({
+                            "name": cname,
+                            "ref_schema": rows[0].foreign_table_schema,
+                            "ref_table": rows[0].foreign_table_name,
+                            "columns": [{"local": r.column_name, "remote": r.foreign_column_name} for r in rows]
+                        })
+                    entry["foreign_keys"] = fks
+
+                yield entry
+
+        emit_section(out, "tables", table_entries())
 
         # views
-        views = conn.execute(SQL_VIEWS, {
-            "include_schemas": include_schemas,
-            "exclude_schemas": tuple(exclude_schemas)
-        }).all()
-        for v in views:
-            snap["views"].append({
-                "schema": v.table_schema,
-                "name": v.table_name,
-                "definition_norm": norm(v.definition)
-            })
+        def view_entries():
+            for v in conn.execute(SQL_VIEWS, schema_params):
+                yield {
+                    "schema": v.table_schema,
+                    "name": v.table_name,
+                    "definition_norm": norm(v.definition)
+                }
+
+        emit_section(out, "views", view_entries())
 
         # functions
-        funcs = conn.execute(SQL_FUNCTIONS, {
-            "include_schemas": include_schemas,
-            "exclude_schemas": tuple(exclude_schemas)
-        }).all()
-        for f in funcs:
-            def_hash = hashlib.sha256(norm(f.definition).encode("utf-8")).hexdigest()
-            snap["functions"].append({
-                "schema": f.schema,
-                "name": f.name,
-                "args": f.args or "",
-                "returns": f.returns or "",
-                "language": f.language or "",
-                "definition_hash": def_hash
-            })
+        def function_entries():
+            for f in conn.execute(SQL_FUNCTIONS, schema_params):
+                yield {
+                    "schema": f.schema,
+                    "name": f.name,
+                    "args": f.args or "",
+                    "returns": f.returns or "",
+                    "language": f.language or "",
+                    "definition_hash": definition_hash(f.definition)
+                }
+
+        emit_section(out, "functions", function_entries())
+
+        # roles
+        def role_entries():
+            for r in conn.execute(SQL_ROLES):
+                yield {
+                    "name": r.rolname,
+                    "can_login": bool(r.rolcanlogin),
+                    "superuser": bool(r.rolsuper),
+                    "inherit": bool(r.rolinherit),
+                    "createrole": bool(r.rolcreaterole),
+                    "createdb": bool(r.rolcreatedb),
+                    "replication": bool(r.rolreplication),
+                }
+
+        emit_section(out, "roles", role_entries())
+
+        def membership_entries():
+            for m in conn.execute(SQL_ROLE_MEMBERS):
+                yield {"role": m.role, "member": m.member}
+
+        emit_section(out, "role_memberships", membership_entries())
 
         # sequences
-        seqs = conn.execute(SQL_SEQUENCES, {
-            "include_schemas": include_schemas,
-            "exclude_schemas": tuple(exclude_schemas)
-        }).all()
-        for s in seqs:
-            snap["sequences"].append({
-                "schema": s.sequence_schema,
-                "name": s.sequence_name,
-                "data_type": s.data_type,
-                "start": str(s.start_value),
-                "min": str(s.minimum_value),
-                "max": str(s.maximum_value),
-                "increment": str(s.increment),
-                "cycle": str(s.cycle_option).lower()
-            })
-
-        owns = conn.execute(SQL_SEQUENCE_OWNED_BY).all()
-        for o in owns:
-            if o.schema_name is None:
-                continue
-            snap["sequence_ownerships"].append({
-                "schema": o.schema_name,
-                "sequence": o.sequence_name,
-                "table_schema": o.table_schema or "",
-                "table": o.table_name or "",
-                "column": o.column_name or ""
-            })
-
-    return snap
+        def sequence_entries():
+            for s in conn.execute(SQL_SEQUENCES, schema_params):
+                yield {
+                    "schema": s.sequence_schema,
+                    "name": s.sequence_name,
+                    "data_type": s.data_type,
+                    "start": str(s.start_value),
+                    "min": str(s.minimum_value),
+                    "max": str(s.maximum_value),
+                    "increment": str(s.increment),
+                    "cycle": str(s.cycle_option).lower()
+                }
+
+        emit_section(out, "sequences", sequence_entries())
+
+        def ownership_entries():
+            for o in conn.execute(SQL_SEQUENCE_OWNED_BY):
+                if o.schema_name is None:
+                    continue
+                yield {
+                    "schema": o.schema_name,
+                    "sequence": o.sequence_name,
+                    "table_schema": o.table_schema or "",
+                    "table": o.table_name or "",
+                    "column": o.column_name or ""
+                }
+
+        emit_section(out, "sequence_ownerships", ownership_entries())
 
 def main():
     ap = argparse.ArgumentParser(description="Export Sandbox schema to YAML snapshot (no data).")
@@ -154,18 +192,17 @@ def main():
     ap.add_argument("--out", default="snapshots/schema_snapshot.yaml")
     args = ap.parse_args()
 
-    with open(args.config, "r") as f:
-        cfg = yaml.safe_load(f)
+    cfg = load_yaml_cached(args.config)
 
     sb = cfg["sandbox"]
     engine = create_engine(sb["url"], future=True)
-    snap = export_snapshot(engine,
-                           include_schemas=sb.get("include_schemas", ["public"]),
-                           exclude_schemas=sb.get("exclude_schemas", ["pg_catalog", "information_schema"]),
-                           table_like=sb.get("table_like", "%"))
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
     with open(args.out, "w", encoding="utf-8") as f:
-        yaml.safe_dump(snap, f, sort_keys=False)
+        export_snapshot(engine,
+                        include_schemas=sb.get("include_schemas", ["public"]),
+                        exclude_schemas=sb.get("exclude_schemas", ["pg_catalog", "information_schema"]),
+                        table_like=sb.get("table_like", "%"),
+                        out=f)
     print(f"[export] wrote {args.out}")
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
 import argparse
 import sys
-import yaml
 from sqlalchemy import create_engine
 from utils_sql import *
+from yaml_io import load_yaml_cached
 from collections import defaultdict
 import hashlib
 
@@ -11,67 +11,93 @@ def norm(s: str) -> str:
         return ""
     return " ".join(s.split())
 
+def definition_hash(definition):
+    # must stay in sync with export_schema_yaml (snapshot version 2)
+    return hashlib.blake2b(norm(definition).encode("utf-8"), digest_size=16).hexdigest()
+
 def fail(msg):
     print("[FAIL]", msg)
     return 1
 
+# column metadata compared positionally; one tuple == replaces eight dict lookups
+_COL_FIELDS = ("data_type", "is_nullable", "char_max", "num_precision",
+               "num_scale", "datetime_precision", "default", "is_identity")
+
 def check_tables_columns(conn, snap):
     rc = 0
     # index snapshot tables by (schema,name)
     want_tables = {(t["schema"], t["name"]): t for t in snap.get("tables", [])}
+    if not want_tables:
+        return 0
+
+    # fetch metadata for all snapshot schemas in four round trips
+    params = {
+        "include_schemas": list({s for s, _ in want_tables}),
+        "exclude_schemas": tuple([]),
+        "table_like": "%"
+    }
+    cols_by_tbl = defaultdict(list)
+    for r in conn.execute(SQL_LIST_COLUMNS_BULK, params):
+        cols_by_tbl[(r.table_schema, r.table_name)].append(r)
+    pk_by_tbl = {}
+    for p in conn.execute(SQL_PK_BULK, params):
+        pk_by_tbl[(p.table_schema, p.table_name)] = p
+    uqs_by_tbl = defaultdict(list)
+    for u in conn.execute(SQL_UNIQUES_BULK, params):
+        uqs_by_tbl[(u.table_schema, u.table_name)].append(u)
+    fks_by_tbl = defaultdict(list)
+    for r in conn.execute(SQL_FKS_BULK, params):
+        fks_by_tbl[(r.table_schema, r.table_name)].append(r)
 
     for key, t in want_tables.items():
         schema, name = key
-        rows = conn.execute(SQL_LIST_COLUMNS, {"schema": schema, "table": name}).all()
+        rows = cols_by_tbl.get(key, [])
         if not rows:
             print(f"[FAIL] missing table {schema}.{name}"); rc = 1; continue
 
-        actual = {}
-        for r in rows:
-            actual[r.column_name] = {
-                "data_type": r.udt_name or r.data_type or "",
-                "is_nullable": (r.is_nullable or ""),
-                "char_max": r.character_maximum_length,
-                "num_precision": r.numeric_precision,
-                "num_scale": r.numeric_scale,
-                "datetime_precision": r.datetime_precision,
-                "default": r.column_default,
-                "is_identity": (r.is_identity or ""),
-            }
-
-        want_cols = {c["name"]: c for c in t.get("columns", [])}
+        actual = {r.column_name: ((r.udt_name or r.data_type) or None,
+                                  r.is_nullable or None,
+                                  r.character_maximum_length or None,
+                                  r.numeric_precision or None,
+                                  r.numeric_scale or None,
+                                  r.datetime_precision or None,
+                                  r.column_default or None,
+                                  r.is_identity or None) for r in rows}
+
+        want_cols = {c["name"]: tuple(c.get(k) or None for k in _COL_FIELDS)
+                     for c in t.get("columns", [])}
         # compare columns present
-        for cname, meta in want_cols.items():
-            if cname not in actual:
+        for cname, want_meta in want_cols.items():
+            have_meta = actual.get(cname)
+            if have_meta is None:
                 print(f"[FAIL] {schema}.{name} missing column {cname}"); rc = 1; continue
-            for k, wv in meta.items():
-                if k == "name": continue
-                av = actual[cname].get(k)
-                if (wv or None) != (av or None):
-                    print(f"[FAIL] {schema}.{name}.{cname} mismatch {k}: expected '{wv}' got '{av}'"); rc = 1
-
-        # extra columns
-        extra = set(actual.keys()) - set(want_cols.keys())
+            if want_meta != have_meta:
+                for k, wv, av in zip(_COL_FIELDS, want_meta, have_meta):
+                    if wv != av:
+                        print(f"[FAIL] {schema}.{name}.{cname} mismatch {k}: expected '{wv}' got '{av}'"); rc = 1
+
+        # extra columns (dict-view difference, no temporary sets)
+        extra = actual.keys() - want_cols.keys()
         if extra:
             print(f"[FAIL] {schema}.{name} has unexpected columns: {sorted(extra)}"); rc = 1
 
         # PK
         want_pk = t.get("primary_key")
-        pk_rows = conn.execute(SQL_PK, {"schema": schema, "table": name}).all()
+        pk = pk_by_tbl.get(key)
         if want_pk:
             want_cols_list = list(want_pk.get("columns", []))
-            if not pk_rows:
+            if pk is None:
                 print(f"[FAIL] {schema}.{name} missing primary key"); rc = 1
             else:
-                have_cols = list(pk_rows[0].columns)
+                have_cols = list(pk.columns)
                 if want_cols_list != have_cols:
                     print(f"[FAIL] {schema}.{name} PK columns differ: expected {want_cols_list} got {have_cols}"); rc = 1
-        elif pk_rows:
+        elif pk is not None:
             print(f"[FAIL] {schema}.{name} has PK but snapshot shows none"); rc = 1
 
         # UNIQUEs
         want_uqs = [tuple(u.get("columns", [])) for u in t.get("uniques", [])]
-        have_uqs = [tuple(u.columns) for u in conn.execute(SQL_UNIQUES, {"schema": schema, "table": name}).all()]
+        have_uqs = [tuple(u.columns) for u in uqs_by_tbl.get(key, [])]
         if sorted(want_uqs) != sorted(have_uqs):
             print(f"[FAIL] {schema}.{name} UNIQUE sets differ: expected {sorted(want_uqs)} got {sorted(have_uqs)}"); rc = 1
 
@@ -81,7 +107,7 @@ def check_tables_columns(conn, snap):
             maps = tuple((m["local"], m["remote"]) for m in fk.get("columns", []))
             want_fks.append((fk.get("name"), fk.get("ref_schema"), fk.get("ref_table"), maps))
 
-        have_fk_rows = conn.execute(SQL_FKS, {"schema": schema, "table": name}).all()
+        have_fk_rows = fks_by_tbl.get(key, [])
         groups = defaultdict(list)
         for r in have_fk_rows:
             groups[r.constraint_name].append((r.column_name, r.foreign_column_name, r.foreign_table_schema, r.foreign_table_name))
@@ -106,11 +132,16 @@ def check_views(conn, snap):
         "exclude_schemas": tuple([])
     }).all()
     have = {(r.table_schema, r.table_name): norm(r.definition) for r in rows}
-    for key, wdef in want.items():
-        if key not in have:
-            print(f"[FAIL] missing view {key[0]}.{key[1]}"); rc = 1
-        elif have[key] != wdef:
-            print(f"[FAIL] view def differs for {key[0]}.{key[1]}"); rc = 1
+    # one C-level items() difference finds missing views and changed definitions
+    changed = want.items() - have.items()
+    if changed:
+        missing = want.keys() - have.keys()
+        for key, _ in changed:
+            if key in missing:
+                print(f"[FAIL] missing view {key[0]}.{key[1]}")
+            else:
+                print(f"[FAIL] view def differs for {key[0]}.{key[1]}")
+            rc = 1
     return rc
 
 def check_functions(conn, snap):
@@ -123,8 +154,7 @@ def check_functions(conn, snap):
     }).all()
     have = {}
     for r in rows:
-        def_hash = hashlib.sha256(norm(r.definition).encode("utf-8")).hexdigest()
-        have[(r.schema, r.name, r.args or "")] = def_hash
+        have[(r.schema, r.name, r.args or "")] = definition_hash(r.definition)
     for key, wh in want.items():
         if key not in have:
             print(f"[FAIL] missing function {key}"); rc = 1
@@ -185,11 +215,8 @@ def main():
     ap.add_argument("--snapshot", default="snapshots/schema_snapshot.yaml")
     args = ap.parse_args()
 
-    with open(args.config, "r") as f:
-        cfg = yaml.safe_load(f)
-
-    with open(args.snapshot, "r", encoding="utf-8") as f:
-        snap = yaml.safe_load(f) or {}
+    cfg = load_yaml_cached(args.config)
+    snap = load_yaml_cached(args.snapshot) or {}
 
     engine = create_engine(cfg["dev"]["url"], future=True)
     rc = 0
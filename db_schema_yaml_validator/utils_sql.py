@@ -26,6 +26,29 @@ WHERE c.table_schema=:schema AND c.table_name=:table
 ORDER BY c.ordinal_position
 """)
 
+SQL_LIST_COLUMNS_BULK = text("""
+SELECT c.table_schema,
+       c.table_name,
+       c.column_name,
+       c.is_nullable,
+       c.data_type,
+       c.udt_name,
+       c.character_maximum_length,
+       c.numeric_precision,
+       c.numeric_scale,
+       c.datetime_precision,
+       c.column_default,
+       c.is_identity
+FROM information_schema.columns c
+JOIN information_schema.tables t
+  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+WHERE t.table_type='BASE TABLE'
+  AND c.table_schema = ANY(:include_schemas)
+  AND c.table_schema NOT IN :exclude_schemas
+  AND c.table_name LIKE :table_like
+ORDER BY c.table_schema, c.table_name, c.ordinal_position
+""")
+
 SQL_PK = text("""
 SELECT tc.constraint_name,
        array_agg(kcu.column_name ORDER BY kcu.ordinal_position) AS columns
@@ -51,6 +74,41 @@ GROUP BY tc.constraint_name
 ORDER BY tc.constraint_name
 """)
 
+SQL_PK_BULK = text("""
+SELECT tc.table_schema,
+       tc.table_name,
+       tc.constraint_name,
+       array_agg(kcu.column_name ORDER BY kcu.ordinal_position) AS columns
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+ AND tc.table_name = kcu.table_name
+WHERE tc.constraint_type='PRIMARY KEY'
+  AND tc.table_schema = ANY(:include_schemas)
+  AND tc.table_schema NOT IN :exclude_schemas
+  AND tc.table_name LIKE :table_like
+GROUP BY tc.table_schema, tc.table_name, tc.constraint_name
+""")
+
+SQL_UNIQUES_BULK = text("""
+SELECT tc.table_schema,
+       tc.table_name,
+       tc.constraint_name,
+       array_agg(kcu.column_name ORDER BY kcu.ordinal_position) AS columns
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+ AND tc.table_name = kcu.table_name
+WHERE tc.constraint_type='UNIQUE'
+  AND tc.table_schema = ANY(:include_schemas)
+  AND tc.table_schema NOT IN :exclude_schemas
+  AND tc.table_name LIKE :table_like
+GROUP BY tc.table_schema, tc.table_name, tc.constraint_name
+ORDER BY tc.table_schema, tc.table_name, tc.constraint_name
+""")
+
 SQL_FKS = text("""
 SELECT
   tc.constraint_name,
@@ -72,6 +130,30 @@ WHERE tc.table_schema = :schema
 ORDER BY tc.constraint_name, kcu.ordinal_position
 """)
 
+SQL_FKS_BULK = text("""
+SELECT
+  tc.table_schema,
+  tc.table_name,
+  tc.constraint_name,
+  kcu.column_name,
+  ccu.table_schema AS foreign_table_schema,
+  ccu.table_name AS foreign_table_name,
+  ccu.column_name AS foreign_column_name,
+  kcu.ordinal_position
+FROM information_schema.table_constraints AS tc
+JOIN information_schema.key_column_usage AS kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+ AND tc.table_name = kcu.table_name
+JOIN information_schema.constraint_column_usage AS ccu
+  ON ccu.constraint_name = tc.constraint_name
+WHERE tc.constraint_type = 'FOREIGN KEY'
+  AND tc.table_schema = ANY(:include_schemas)
+  AND tc.table_schema NOT IN :exclude_schemas
+  AND tc.table_name LIKE :table_like
+ORDER BY tc.table_schema, tc.table_name, tc.constraint_name, kcu.ordinal_position
+""")
+
 SQL_SEQUENCES = text("""
 SELECT sequence_schema, sequence_name, data_type, start_value, minimum_value, maximum_value, increment, cycle_option
 FROM information_schema.sequences
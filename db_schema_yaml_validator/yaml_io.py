@@ -0,0 +1,34 @@
+import os
+import pickle
+import tempfile
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+def load_yaml_cached(path):
+    """Load a YAML file, keeping a pickle sidecar so warm invocations skip the parse."""
+    cache = path + ".pkl"
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(path):
+            with open(cache, "rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(cache)) or ".", delete=False)
+    try:
+        pickle.dump(data, tmp)
+        tmp.close()
+        os.replace(tmp.name, cache)
+    except OSError:
+        tmp.close()
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+    return data
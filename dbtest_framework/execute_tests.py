@@ -12,10 +12,14 @@ def run_pytest(release: str):
     print(f"[INFO] Running tests in {test_dir}")
     print(f"[INFO] Generating report: {report_file}")
 
+    # generated test files are independent; spread them across cores but keep
+    # each file on one worker so its DB connection is reused
     result = pytest.main([
         test_dir,
         "--html=" + report_file,
-        "--self-contained-html"
+        "--self-contained-html",
+        "-n", "auto",
+        "--dist=loadfile"
     ])
 
     if result == 0:
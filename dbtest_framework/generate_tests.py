@@ -1,20 +1,75 @@
 import os
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import psycopg2
 import yaml
 
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+# YAML emission is the only per-table work left once metadata is bulk-fetched;
+# a few workers overlap the file writes
+DEFAULT_JOBS = 4
+
+# resolve these once instead of os.path.join-ing in per-table hot paths
+_SQL_DIR = os.path.abspath("sql")
+_OUT_DIR = os.path.abspath("expected/tables")
+os.makedirs(_OUT_DIR, exist_ok=True)
+
+def connect():
+    return psycopg2.connect(
+        host="localhost",
+        dbname="sandbox_db",
+        user="sandbox_user",
+        password="secret"
+    )
+
+@lru_cache(maxsize=None)
 def load_sql(filename):
-    with open(os.path.join("sql", filename)) as f:
+    with open(os.path.join(_SQL_DIR, filename)) as f:
         return f.read()
 
+def iter_all_tables(conn):
+    """Yield (schema, table) rows lazily via a server-side cursor."""
+    with conn.cursor(name="all_tables_cur") as cur:
+        cur.itersize = 1000
+        cur.execute(load_sql("all_tables.sql"))
+        yield from cur
+
 def get_all_tables(conn):
+    return list(iter_all_tables(conn))
+
+# (name, parameter count varies only in position: all take schema, table)
+_METADATA_STMTS = (
+    ("meta_cols", "columns.sql"),
+    ("meta_pk", "primary_key.sql"),
+    ("meta_uc", "unique_constraints.sql"),
+    ("meta_trg", "triggers.sql"),
+)
+
+_prepared_conns = weakref.WeakSet()
+
+def _ensure_prepared(conn):
+    # PREPARE once per connection so repeated extract_metadata calls skip
+    # the server-side parse/plan of the same four queries
+    if conn in _prepared_conns:
+        return
     with conn.cursor() as cur:
-        cur.execute(load_sql("all_tables.sql"))
-        return cur.fetchall()
+        for name, filename in _METADATA_STMTS:
+            sql = load_sql(filename).replace("%s", "$1", 1).replace("%s", "$2", 1)
+            cur.execute(f"PREPARE {name}(text, text) AS {sql}")
+    _prepared_conns.add(conn)
 
 def extract_metadata(conn, schema, table):
+    _ensure_prepared(conn)
     snapshot = {"columns": []}
     with conn.cursor() as cur:
-        cur.execute(load_sql("columns.sql"), (schema, table))
+        cur.execute("EXECUTE meta_cols(%s, %s)", (schema, table))
         for row in cur.fetchall():
             snapshot["columns"].append({
                 "name": row[0],
@@ -23,42 +78,75 @@ def extract_metadata(conn, schema, table):
                 "default": row[3]
             })
 
-        cur.execute(load_sql("primary_key.sql"), (schema, table))
+        cur.execute("EXECUTE meta_pk(%s, %s)", (schema, table))
         pk = [r[0] for r in cur.fetchall()]
         if pk:
             snapshot["primary_key"] = pk
 
-        cur.execute(load_sql("unique_constraints.sql"), (schema, table))
+        cur.execute("EXECUTE meta_uc(%s, %s)", (schema, table))
         uc = [r[0] for r in cur.fetchall()]
         if uc:
             snapshot["unique_constraints"] = uc
 
-        cur.execute(load_sql("triggers.sql"), (schema, table))
+        cur.execute("EXECUTE meta_trg(%s, %s)", (schema, table))
         triggers = [{"name": r[0], "event": r[1], "function": r[2]} for r in cur.fetchall()]
         if triggers:
             snapshot["triggers"] = triggers
 
     return snapshot
 
+def extract_metadata_bulk(conn, targets):
+    """Fetch columns/PKs/uniques/triggers for every target table in one round trip."""
+    schemas = sorted({s for s, _ in targets})
+    tables = sorted({t for _, t in targets})
+    buckets = defaultdict(lambda: {"col": [], "pk": [], "uc": [], "trg": []})
+    with conn.cursor() as cur:
+        cur.execute(load_sql("metadata_bulk.sql"), (schemas, tables) * 4)
+        for kind, schema, table, f1, f2, f3, f4, _order in cur.fetchall():
+            if kind == "col":
+                buckets[(schema, table)]["col"].append({
+                    "name": f1,
+                    "type": f2,
+                    "nullable": f3 == "YES",
+                    "default": f4
+                })
+            else:
+                entry = {"name": f1, "event": f2, "function": f3} if kind == "trg" else f1
+                buckets[(schema, table)][kind].append(entry)
+
+    snapshots = {}
+    for key in targets:
+        bucket = buckets.get(key)
+        snapshot = {"columns": bucket["col"] if bucket else []}
+        if bucket:
+            if bucket["pk"]:
+                snapshot["primary_key"] = bucket["pk"]
+            if bucket["uc"]:
+                snapshot["unique_constraints"] = bucket["uc"]
+            if bucket["trg"]:
+                snapshot["triggers"] = bucket["trg"]
+        snapshots[key] = snapshot
+    return snapshots
+
 def save_yaml(table, snapshot):
-    os.makedirs("expected/tables", exist_ok=True)
-    with open(f"expected/tables/{table}.yaml", "w") as f:
-        yaml.dump(snapshot, f, sort_keys=False)
+    with open(f"{_OUT_DIR}/{table}.yaml", "w") as f:
+        yaml.dump(snapshot, f, Dumper=_Dumper, sort_keys=False)
 
-def main():
-    conn = psycopg2.connect(
-        host="localhost",
-        dbname="sandbox_db",
-        user="sandbox_user",
-        password="secret"
-    )
+def main(jobs=DEFAULT_JOBS):
+    conn = connect()
     try:
-        for schema, table in get_all_tables(conn):
-            print(f"Generating snapshot for {schema}.{table}")
-            snapshot = extract_metadata(conn, schema, table)
-            save_yaml(table, snapshot)
+        tables = get_all_tables(conn)
+        snapshots = extract_metadata_bulk(conn, tables)
     finally:
         conn.close()
 
+    def generate_one(target):
+        schema, table = target
+        print(f"Generating snapshot for {schema}.{table}")
+        save_yaml(table, snapshots[(schema, table)])
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(generate_one, tables))
+
 if __name__ == "__main__":
     main()
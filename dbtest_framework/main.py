@@ -1,6 +1,8 @@
-import subprocess
 import sys
 
+import execute_tests
+import generate_tests
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python main.py <release>")
@@ -9,10 +11,10 @@ def main():
     release = sys.argv[1]
 
     print(f"[INFO] Generating test cases for release: {release}")
-    subprocess.run(["python", "generate_tests.py", release], check=True)
+    generate_tests.main()
 
     print(f"[INFO] Executing tests for release: {release}")
-    subprocess.run(["python", "execute_tests.py", release], check=True)
+    execute_tests.run_pytest(release)
 
 if __name__ == "__main__":
     main()
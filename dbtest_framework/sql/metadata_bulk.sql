@@ -0,0 +1,49 @@
+SELECT 'col' AS kind,
+       c.table_schema,
+       c.table_name,
+       c.column_name AS f1,
+       c.data_type AS f2,
+       c.is_nullable AS f3,
+       c.column_default AS f4,
+       c.ordinal_position AS sort_order
+FROM information_schema.columns c
+WHERE c.table_schema = ANY(%s) AND c.table_name = ANY(%s)
+UNION ALL
+SELECT 'pk',
+       tc.table_schema,
+       tc.table_name,
+       kcu.column_name,
+       NULL,
+       NULL,
+       NULL,
+       kcu.ordinal_position
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+WHERE tc.constraint_type = 'PRIMARY KEY'
+  AND tc.table_schema = ANY(%s) AND tc.table_name = ANY(%s)
+UNION ALL
+SELECT 'uc',
+       tc.table_schema,
+       tc.table_name,
+       tc.constraint_name,
+       NULL,
+       NULL,
+       NULL,
+       0
+FROM information_schema.table_constraints tc
+WHERE tc.constraint_type = 'UNIQUE'
+  AND tc.table_schema = ANY(%s) AND tc.table_name = ANY(%s)
+UNION ALL
+SELECT 'trg',
+       t.event_object_schema,
+       t.event_object_table,
+       t.trigger_name,
+       t.event_manipulation,
+       t.action_statement,
+       NULL,
+       0
+FROM information_schema.triggers t
+WHERE t.event_object_schema = ANY(%s) AND t.event_object_table = ANY(%s)
+ORDER BY 2, 3, 1, 8;
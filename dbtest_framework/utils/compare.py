@@ -1,8 +1,66 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+@lru_cache(maxsize=None)
+def _load_yaml_cached(abspath, mtime):
+    # JSON parses roughly 10x faster than YAML, so keep a sidecar and only
+    # fall back to the YAML parser when the source file changed
+    cache = abspath + ".cache.json"
+    try:
+        if os.path.getmtime(cache) >= mtime:
+            with open(cache) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    with open(abspath) as f:
+        obj = yaml.load(f, Loader=_Loader)
+    try:
+        with open(cache, "w") as f:
+            json.dump(obj, f)
+    except (OSError, TypeError):
+        pass
+    return obj
+
 def load_yaml(path):
-    with open(path) as f:
-        return yaml.safe_load(f)
+    abspath = os.path.abspath(path)
+    return _load_yaml_cached(abspath, os.path.getmtime(abspath))
+
+def snapshot_hash(snapshot):
+    """16-byte fingerprint over canonical JSON; equal dicts hash equal."""
+    payload = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def compare_snapshots(expected_path, actual):
+    """True when ``actual`` matches the expected snapshot on disk.
+
+    A ``.sha`` sidecar holding the expected snapshot's fingerprint lets the
+    common unchanged case skip the YAML parse entirely; the sidecar is only
+    trusted while newer than the snapshot file, and is refreshed after any
+    structural comparison.
+    """
+    actual_hash = snapshot_hash(actual)
+    sha = expected_path + ".sha"
+    try:
+        if os.path.getmtime(sha) >= os.path.getmtime(expected_path):
+            with open(sha, "rb") as f:
+                return f.read() == actual_hash
+    except OSError:
+        pass
 
-def compare_snapshots(expected, actual):
+    expected = load_yaml(expected_path)
+    try:
+        with open(sha, "wb") as f:
+            f.write(snapshot_hash(expected))
+    except OSError:
+        pass
     return expected == actual
@@ -1,17 +1,44 @@
+import threading
+from functools import lru_cache
+
 import yaml
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# enough connections for the parallel generate/export workers
+POOL_MAX = 8
 
+_pools = {}
+_pools_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
 def load_config(env_file="config/envs.yaml"):
     with open(env_file) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_Loader)
+
+def _get_pool(env_name):
+    with _pools_lock:
+        pool = _pools.get(env_name)
+        if pool is None:
+            env = load_config()[env_name]
+            pool = _pools[env_name] = ThreadedConnectionPool(
+                1, POOL_MAX,
+                host=env["host"],
+                port=env["port"],
+                user=env["user"],
+                password=env["password"],
+                dbname=env["dbname"]
+            )
+        return pool
 
 def get_connection(env_name="sandbox"):
-    config = load_config()
-    env = config[env_name]
-    return psycopg2.connect(
-        host=env["host"],
-        port=env["port"],
-        user=env["user"],
-        password=env["password"],
-        dbname=env["dbname"]
-    )
+    """Borrow a connection from the per-env pool; return it with put_connection."""
+    return _get_pool(env_name).getconn()
+
+def put_connection(conn, env_name="sandbox"):
+    _get_pool(env_name).putconn(conn)
@@ -9,13 +9,92 @@ import org.dbunit.dataset.xml.FlatXmlDataSetBuilder;
 import org.dbunit.ext.postgresql.PostgresqlDataTypeFactory;
 
 import java.io.File;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
 import java.sql.Connection;
 import java.sql.DriverManager;
 import java.util.Arrays;
 import java.util.List;
 
 public class DbUnitRunner {
+
+    private static DatabaseConnection wrapConnection(Connection conn) throws Exception {
+        DatabaseConnection dbConn = new DatabaseConnection(conn);
+        DatabaseConfig config = dbConn.getConfig();
+        config.setProperty(DatabaseConfig.PROPERTY_DATATYPE_FACTORY, new PostgresqlDataTypeFactory());
+        return dbConn;
+    }
+
+    private static void compareOne(DatabaseConnection dbConn, String flatXml, String tableName,
+                                   List<String> excludes) throws Exception {
+        FlatXmlDataSetBuilder builder = new FlatXmlDataSetBuilder();
+        builder.setColumnSensing(true);
+        IDataSet expected = builder.build(new File(flatXml));
+        ITable expectedTable = expected.getTable(tableName);
+
+        IDataSet actualDs = dbConn.createDataSet(new String[]{tableName});
+        ITable actualTable = actualDs.getTable(tableName);
+
+        if (excludes.isEmpty()) {
+            Assertion.assertEquals(expectedTable, actualTable);
+        } else {
+            Assertion.assertEqualsIgnoreCols(expectedTable, actualTable, excludes.toArray(new String[0]));
+        }
+        System.out.println("[DBUnit] OK: " + tableName);
+    }
+
+    private static List<String> parseExcludes(String arg) {
+        return arg != null && !arg.isBlank() ? Arrays.asList(arg.split(",")) : List.of();
+    }
+
+    // --batch <manifest> <jdbcUrl> <user> <pass> [excludeColumns]
+    // Manifest: one "flatXmlFile<TAB>tableName" pair per line; all comparisons
+    // share one JVM and one DB connection. Exits with the failure count,
+    // capped at 255 so it survives the POSIX 8-bit exit status.
+    private static void runBatch(String[] args) throws Exception {
+        if (args.length < 5) {
+            System.err.println("Usage: DbUnitRunner --batch <manifest> <jdbcUrl> <user> <pass> [excludeColumns]");
+            System.exit(2);
+        }
+        final String manifest = args[1];
+        final String jdbc = args[2];
+        final String user = args[3];
+        final String pass = args[4];
+        final List<String> excludes = args.length >= 6 ? parseExcludes(args[5]) : List.of();
+
+        int failures = 0;
+        try (Connection conn = DriverManager.getConnection(jdbc, user, pass)) {
+            DatabaseConnection dbConn = wrapConnection(conn);
+            for (String line : Files.readAllLines(Path.of(manifest), StandardCharsets.UTF_8)) {
+                if (line.isBlank()) {
+                    continue;
+                }
+                String[] parts = line.split("\t", 2);
+                String flatXml = parts[0];
+                String tableName = parts[1];
+                try {
+                    compareOne(dbConn, flatXml, tableName, excludes);
+                } catch (AssertionError ae) {
+                    System.err.println("[DBUnit] MISMATCH: " + tableName + " -> " + ae.getMessage());
+                    failures++;
+                } catch (Exception e) {
+                    System.err.println("[DBUnit] ERROR: " + tableName + " -> " + e.getMessage());
+                    e.printStackTrace();
+                    failures++;
+                }
+            }
+        }
+        // POSIX truncates the status to 8 bits, so exactly 256 failures would
+        // read back as success; saturate at 255 instead
+        System.exit(Math.min(failures, 255));
+    }
+
     public static void main(String[] args) throws Exception {
+        if (args.length >= 1 && args[0].equals("--batch")) {
+            runBatch(args);
+            return;
+        }
         if (args.length < 5) {
             System.err.println("Usage: DbUnitRunner <jdbcUrl> <user> <pass> <flatXmlFile> <tableName> [excludeColumns]");
             System.exit(2);
@@ -25,28 +104,10 @@ public class DbUnitRunner {
         final String pass = args[2];
         final String flatXml = args[3];
         final String tableName = args[4];
-        final List<String> excludes = args.length >= 6 && !args[5].isBlank()
-                ? Arrays.asList(args[5].split(",")) : List.of();
+        final List<String> excludes = args.length >= 6 ? parseExcludes(args[5]) : List.of();
 
         try (Connection conn = DriverManager.getConnection(jdbc, user, pass)) {
-            DatabaseConnection dbConn = new DatabaseConnection(conn);
-            DatabaseConfig config = dbConn.getConfig();
-            config.setProperty(DatabaseConfig.PROPERTY_DATATYPE_FACTORY, new PostgresqlDataTypeFactory());
-
-            FlatXmlDataSetBuilder builder = new FlatXmlDataSetBuilder();
-            builder.setColumnSensing(true);
-            IDataSet expected = builder.build(new File(flatXml));
-            ITable expectedTable = expected.getTable(tableName);
-
-            IDataSet actualDs = dbConn.createDataSet(new String[]{tableName});
-            ITable actualTable = actualDs.getTable(tableName);
-
-            if (excludes.isEmpty()) {
-                Assertion.assertEquals(expectedTable, actualTable);
-            } else {
-                Assertion.assertEqualsIgnoreCols(expectedTable, actualTable, excludes.toArray(new String[0]));
-            }
-            System.out.println("[DBUnit] OK: " + tableName);
+            compareOne(wrapConnection(conn), flatXml, tableName, excludes);
         } catch (AssertionError ae) {
             System.err.println("[DBUnit] MISMATCH: " + tableName + " -> " + ae.getMessage());
             System.exit(1);
@@ -1,10 +1,19 @@
 import argparse
+import csv
 import os
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Tuple
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+from psycopg2 import sql as pgsql
 from sqlalchemy import create_engine, text
-from xml.etree.ElementTree import Element, tostring
-from xml.dom import minidom
+from xml.sax.saxutils import quoteattr
 
 LIST_TABLES_SQL = """
 SELECT t.table_schema, t.table_name
@@ -24,34 +33,43 @@ WHERE c.table_schema = :schema
 ORDER BY c.ordinal_position
 """
 
+LIST_ALL_COLUMNS_SQL = """
+SELECT c.table_schema, c.table_name, c.column_name, c.data_type
+FROM information_schema.columns c
+WHERE c.table_schema = ANY(:schemas)
+  AND c.table_name = ANY(:tables)
+ORDER BY c.table_schema, c.table_name, c.ordinal_position
+"""
+
 def parse_args():
     ap = argparse.ArgumentParser(description="Export Sandbox tables (discovered via SQL) as DBUnit Flat XML per table.")
     ap.add_argument("--config", required=True, help="Path to config.yaml")
     ap.add_argument("--outdir", default="datasets", help="Output directory for XML files")
     ap.add_argument("--only_tables", nargs="*", help="Optional explicit list of schema.table overrides discovery")
+    ap.add_argument("--parallelism", type=int, default=4, help="Number of tables exported concurrently")
     return ap.parse_args()
 
+@lru_cache(maxsize=None)
 def load_cfg(path):
     with open(path, "r") as f:
-        return yaml.safe_load(f)
-
-def pretty_xml(elem):
-    rough = tostring(elem, encoding="utf-8")
-    return minidom.parseString(rough).toprettyxml(indent="  ", encoding="utf-8").decode("utf-8")
-
-def row_to_elem(tag_name, row: dict):
-    el = Element(tag_name)
-    for k, v in row.items():
-        if v is None:
-            continue  # DBUnit NULL: omit attribute
-        el.set(k, "" if v == "" else str(v))
-    return el
-
-def build_dataset(tag_name, rows):
-    ds = Element("dataset")
-    for r in rows:
-        ds.append(row_to_elem(tag_name, r))
-    return ds
+        return yaml.load(f, Loader=_YamlLoader)
+
+_engine = None
+
+def get_engine(url, size):
+    """Lazily build one module-level engine so repeated runs (e.g. driven
+    in-process) reuse a warm connection pool instead of reconnecting."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            url,
+            future=True,
+            pool_size=size,
+            max_overflow=0,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+        )
+    return _engine
 
 def discover_tables(conn, include_schemas: List[str], exclude_schemas: List[str], like: str) -> List[Tuple[str,str]]:
     # For Postgres, SQLAlchemy/psycopg2 passes arrays using tuple/list bindings.
@@ -69,18 +87,96 @@ def fetch_columns(conn, schema: str, table: str) -> List[str]:
     res = conn.execute(text(LIST_COLUMNS_SQL), {"schema": schema, "table": table})
     return [r[0] for r in res]
 
-def export_table(conn, schema: str, table: str, cols: List[str], outdir: str, row_limit: int | None):
-    col_list = ", ".join([f'"{c}"' for c in cols]) if cols else "*"
-    sql = f'SELECT {col_list} FROM "{schema}"."{table}"'
+def fetch_all_columns(conn, targets: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
+    """(column, data_type) lists for every target table in a single round trip."""
+    if not targets:
+        return {}
+    res = conn.execute(text(LIST_ALL_COLUMNS_SQL), {
+        "schemas": sorted({s for s, _ in targets}),
+        "tables": sorted({t for _, t in targets}),
+    })
+    cols: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+    for schema, table, column, data_type in res:
+        cols.setdefault((schema, table), []).append((column, data_type))
+    return cols
+
+# marker telling SQL NULL apart from the empty string in the CSV stream
+COPY_NULL = "\\N"
+
+def copy_csv_rows(conn, copy_sql):
+    """Yield CSV records from COPY TO STDOUT without buffering the whole table.
+
+    COPY runs on a pump thread writing into a pipe; the generator reads the
+    other end, so Postgres produces CSV at backend speed while we consume it
+    row by row.
+    """
+    raw = conn.connection  # underlying DBAPI (psycopg2) connection
+    r_fd, w_fd = os.pipe()
+    errors = []
+
+    def pump():
+        try:
+            with os.fdopen(w_fd, "wb") as w, raw.cursor() as cur:
+                cur.copy_expert(copy_sql, w)
+        except Exception as e:  # re-raised on the consumer side once drained
+            errors.append(e)
+
+    t = threading.Thread(target=pump, daemon=True)
+    t.start()
+    with os.fdopen(r_fd, "r", encoding="utf-8", newline="") as r:
+        yield from csv.reader(r)
+    t.join()
+    if errors:
+        raise errors[0]
+
+def make_row_writer(tag):
+    """Build a per-table row writer with the constant pieces precomputed."""
+    opening = f"  <{tag} "
+    empty = f"  <{tag}/>\n"
+    q = quoteattr  # local binding saves a global lookup per attribute
+    def write_row(f, row):
+        # DBUnit NULL: omit attribute
+        attrs = " ".join(f"{k}={q(v)}" for k, v in row.items() if v is not None)
+        f.write(opening + attrs + "/>\n" if attrs else empty)
+    return write_row
+
+def export_table(conn, schema: str, table: str, cols: List[Tuple[str, str]], outdir: str, row_limit: int | None):
+    # compose identifiers server-side rather than f-string quoting by hand.
+    # COPY writes booleans in Postgres text form (t/f), which DBUnit's
+    # BooleanDataType rejects; the explicit text cast yields true/false
+    if cols:
+        col_list = pgsql.SQL(", ").join(
+            pgsql.SQL("{col}::text AS {col}").format(col=pgsql.Identifier(name))
+            if data_type == "boolean" else pgsql.Identifier(name)
+            for name, data_type in cols
+        )
+    else:
+        col_list = pgsql.SQL("*")
+    query = pgsql.SQL("SELECT {cols} FROM {tbl}").format(
+        cols=col_list, tbl=pgsql.Identifier(schema, table)
+    )
     if row_limit:
-        sql += f" LIMIT {int(row_limit)}"
-    rows = [dict(r) for r in conn.execute(text(sql)).mappings()]
+        query += pgsql.SQL(" LIMIT {n}").format(n=pgsql.Literal(int(row_limit)))
     tag = f"{schema}.{table}"  # schema-qualified tag, consistent with DBUnit runner
-    xml = pretty_xml(build_dataset(tag, rows))
     safe = f"{schema}_{table}.xml"
     os.makedirs(outdir, exist_ok=True)
+    # let the backend produce CSV via COPY instead of per-row driver objects
+    copy_sql = pgsql.SQL(
+        "COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true, NULL {null})"
+    ).format(query=query, null=pgsql.Literal(COPY_NULL))
+    records = copy_csv_rows(conn, copy_sql)
+    header = next(records, None)
+    write_row = make_row_writer(tag)
     with open(os.path.join(outdir, safe), "w", encoding="utf-8") as f:
-        f.write(xml)
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        wrote_row = False
+        for rec in records:
+            if not wrote_row:
+                f.write("<dataset>\n")
+                wrote_row = True
+            row = {k: (None if v == COPY_NULL else v) for k, v in zip(header, rec)}
+            write_row(f, row)
+        f.write("</dataset>\n" if wrote_row else "<dataset/>\n")
 
 def main():
     args = parse_args()
@@ -92,7 +188,8 @@ def main():
     table_like = sb.get("table_like", "%")
     row_limit = sb.get("row_limit", None)
 
-    engine = create_engine(sb["url"], future=True)
+    jobs = max(1, args.parallelism)
+    engine = get_engine(sb["url"], jobs)
     with engine.connect() as conn:
         if args.only_tables:
             targets = []
@@ -105,10 +202,17 @@ def main():
         else:
             targets = discover_tables(conn, include_schemas, exclude_schemas, table_like)
 
-        for schema, table in targets:
-            print(f"[export] {schema}.{table}")
-            cols = fetch_columns(conn, schema, table)
-            export_table(conn, schema, table, cols, args.outdir, row_limit)
+        cols_by_table = fetch_all_columns(conn, targets)
+
+    def export_one(target):
+        schema, table = target
+        print(f"[export] {schema}.{table}")
+        with engine.connect() as conn:
+            export_table(conn, schema, table, cols_by_table.get(target, []), args.outdir, row_limit)
+
+    # tables are independent; overlap their SELECT round-trips with XML writing
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(export_one, targets))
 
     print(f"Done. XML datasets written to: {args.outdir}")
 
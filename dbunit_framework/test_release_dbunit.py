@@ -4,6 +4,14 @@ import os
 import sys
 import yaml
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 JAR_PATH = os.path.join("dbunit_runner", "target", "dbunit-runner-jar-with-dependencies.jar")
 
@@ -12,11 +20,14 @@ def parse_args():
     ap.add_argument("--config", required=True, help="Path to config.yaml")
     ap.add_argument("--datasets_dir", default="datasets", help="Directory containing *.xml exports")
     ap.add_argument("--exclude_cols", default="", help="Comma-separated column names to ignore (e.g., created_ts,updated_ts)")
+    ap.add_argument("--parallelism", type=int, default=min(8, os.cpu_count() or 1),
+                    help="Number of comparisons run concurrently")
     return ap.parse_args()
 
+@lru_cache(maxsize=None)
 def load_cfg(path):
     with open(path, "r") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 def sqlalchemy_to_jdbc_pg(sa_url: str, schema: str) -> str:
     # Convert SQLAlchemy PG URL -> JDBC (very small helper for this POC)
@@ -49,15 +60,28 @@ def main():
         print("[error] No XML files found. Did you run export_sandbox.py?", file=sys.stderr)
         sys.exit(2)
 
-    failures = 0
-    for xml in xml_files:
-        # Table tag equals schema-qualified table name; our exporter used filename like schema_table.xml
-        table_name = os.path.basename(xml).replace(".xml", "").replace("_", ".")
-        print(f"[DBUnit] Compare {table_name}")
-        cmd = ["java", "-jar", jar, jdbc_url, user, passwd, xml, table_name, args.exclude_cols]
-        rc = subprocess.call(cmd)
-        if rc != 0:
-            failures += 1
+    # one JVM (and one DB connection) per worker via the runner's --batch mode,
+    # instead of a fresh JVM per XML file
+    jobs = max(1, args.parallelism)
+    batches = [b for b in (xml_files[i::jobs] for i in range(jobs)) if b]
+
+    def compare_batch(batch):
+        with tempfile.NamedTemporaryFile("w", suffix=".manifest", delete=False) as mf:
+            manifest = mf.name
+            for xml in batch:
+                # Table tag equals schema-qualified table name; our exporter used filename like schema_table.xml
+                table_name = os.path.basename(xml).replace(".xml", "").replace("_", ".")
+                print(f"[DBUnit] Compare {table_name}")
+                mf.write(f"{xml}\t{table_name}\n")
+        try:
+            cmd = ["java", "-jar", jar, "--batch", manifest, jdbc_url, user, passwd, args.exclude_cols]
+            # batch mode exits with its failure count
+            return subprocess.call(cmd)
+        finally:
+            os.unlink(manifest)
+
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        failures = sum(executor.map(compare_batch, batches))
 
     if failures:
         print(f"[DBUnit] Completed with {failures} failure(s).")
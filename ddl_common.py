@@ -0,0 +1,115 @@
+"""Shared DDL-splitting helpers used by the FileSplit CLI entry points."""
+
+import re
+import functools
+import importlib
+
+# Precompiled once at import; these run per-statement in tight loops.
+_PK_RE = re.compile(r'PRIMARY\s+KEY', re.IGNORECASE)
+_FK_RE = re.compile(r'FOREIGN\s+KEY', re.IGNORECASE)
+_CREATE_TABLE_RE = re.compile(r'CREATE\s+TABLE\s+(ONLY\s+)?("?[\w\.]+"?)', re.IGNORECASE)
+_ALTER_TABLE_RE = re.compile(r'ALTER\s+TABLE\s+(ONLY\s+)?("?[\w\.]+"?)', re.IGNORECASE)
+
+_TABLE_NAME_RES = {
+    'CREATE TABLE': _CREATE_TABLE_RE,
+    'ALTER TABLE': _ALTER_TABLE_RE,
+}
+
+# Fused per-statement patterns: one scan classifies the statement and captures
+# the table name, one more (ALTERs only) classifies the constraint kind.
+_DDL_RE = re.compile(r'\s*(?P<kind>CREATE\s+TABLE|ALTER\s+TABLE)\s+(?:ONLY\s+)?"?(?P<tbl>[\w.]+)"?', re.IGNORECASE)
+_KEY_RE = re.compile(r'(?P<pk>PRIMARY\s+KEY)|(?P<fk>FOREIGN\s+KEY)', re.IGNORECASE)
+_STMT_SEP_RE = re.compile(r';[ \t]*\n')
+
+def iter_statements(ddl_content):
+    """Yield stripped, non-empty statements without materializing the full list."""
+    last = 0
+    for m in _STMT_SEP_RE.finditer(ddl_content):
+        stmt = ddl_content[last:m.start()].strip()
+        if stmt:
+            yield stmt
+        last = m.end()
+    tail = ddl_content[last:].strip()
+    if tail:
+        yield tail
+
+@functools.lru_cache(maxsize=8)
+def _cmd_re(command):
+    return re.compile(rf'{command}\s+(ONLY\s+)?("?[\w\.]+"?)', re.IGNORECASE)
+
+def extract_table_name(statement, command):
+    # known commands hit the precompiled dict; anything else compiles once
+    pattern = _TABLE_NAME_RES.get(command) or _cmd_re(command)
+    match = pattern.search(statement)
+    if match:
+        return match.group(2).strip('"')
+    return None
+
+def is_primary_key(statement):
+    return _PK_RE.search(statement) is not None
+
+def is_foreign_key(statement):
+    return _FK_RE.search(statement) is not None
+
+def separate_ddl_statements(ddl_content):
+    try:
+        create_tables = {}
+        alter_statements = []
+        alters_for_existing = []
+
+        for stmt in iter_statements(ddl_content):
+            m = _DDL_RE.search(stmt)
+            if m is not None and m.group('kind').upper().startswith('CREATE'):
+                create_tables[m.group('tbl')] = stmt + ';'
+            else:
+                table_name = m.group('tbl') if m else None
+                key = _KEY_RE.search(stmt) if m else None
+                alter_statements.append((stmt + ';', table_name, key.lastgroup if key else None))
+
+        alters_grouped = {}
+        for stmt, table_name, key_kind in alter_statements:
+            if table_name is not None and table_name in create_tables:
+                alters_grouped.setdefault(table_name, []).append((stmt, key_kind))
+            else:
+                alters_for_existing.append(stmt)
+
+        new_table_ddl = []
+        for table_name, create_stmt in create_tables.items():
+            new_table_ddl.append(create_stmt)
+            pk_stmts, fk_stmts, other_stmts = [], [], []
+            for alter_stmt, key_kind in alters_grouped.get(table_name, []):
+                if key_kind == 'pk':
+                    pk_stmts.append(alter_stmt)
+                elif key_kind == 'fk':
+                    fk_stmts.append(alter_stmt)
+                else:
+                    other_stmts.append(alter_stmt)
+            new_table_ddl.extend(pk_stmts + fk_stmts + other_stmts)
+
+        return new_table_ddl, alters_for_existing
+    except Exception as e:
+        raise RuntimeError(f"Error while parsing DDL statements: {e}")
+
+def write_statements(out, statements):
+    """Write statements separated by blank lines without concatenating them first."""
+    for i, stmt in enumerate(statements):
+        if i:
+            out.write('\n\n')
+        out.write(stmt)
+
+def run_script(script_name, input_file, output_folder, db_type=None):
+    """Run create.py/alter.py in-process; each must expose main(argv)."""
+    argv = [input_file, '--output', output_folder]
+    if db_type:
+        argv += ['--db', db_type]
+    try:
+        module = importlib.import_module(script_name.removesuffix('.py'))
+    except ImportError:
+        raise RuntimeError(f"Script '{script_name}' not found. Make sure it exists.")
+    try:
+        print(f"🔧 Running: {script_name} {' '.join(argv)}")
+        module.main(argv)
+    except SystemExit as e:
+        if e.code:
+            raise RuntimeError(f"Script '{script_name}' failed with exit code {e.code}")
+
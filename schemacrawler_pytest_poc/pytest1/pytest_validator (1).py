@@ -9,14 +9,21 @@ import os
 import pytest
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 import argparse
 import logging
+from collections import defaultdict
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from jinja2 import Template
+from jinja2 import Environment
 from sql_queries import get_query
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pre-warm the memoized query lookup for everything the tests request
+for _query_name in ('all_existing_objects', 'all_table_columns', 'table_columns'):
+    get_query('validation', _query_name)
+
 @dataclass
 class ValidationResult:
     test_name: str
@@ -36,46 +47,72 @@ class SchemaValidator:
     def __init__(self, connection_params: Dict[str, str], json_dir: str = "schema_json"):
         self.connection_params = connection_params
         self.json_dir = json_dir
-        self.connection = None
+        self.pool = None
         self.validation_results = []
-        
+        self._json_cache = {}
+
     def connect(self):
-        """Establish database connection"""
+        """Establish database connection pool"""
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            self.pool = ThreadedConnectionPool(1, 6, **self.connection_params)
             logger.info("Connected to dev database successfully")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
-    
+
     def disconnect(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            logger.info("Database connection closed")
-    
-    def execute_query(self, query: str) -> List[Dict]:
-        """Execute query and return results"""
+        """Close database connections"""
+        if self.pool:
+            self.pool.closeall()
+            logger.info("Database connections closed")
+
+    def execute_query(self, query: str, params: Optional[Dict] = None) -> List[Dict]:
+        """Execute query (optionally with named parameters) and return results"""
+        connection = self.pool.getconn()
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query)
+            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(query, params)
                 return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise
+        finally:
+            self.pool.putconn(connection)
     
     def load_json_file(self, filename: str) -> Any:
-        """Load JSON file"""
+        """Load JSON file, parsing each file at most once per validator.
+
+        Callers treat the result as read-only, so the cached object is
+        returned directly.
+        """
+        if filename in self._json_cache:
+            return self._json_cache[filename]
         filepath = os.path.join(self.json_dir, filename)
+
+        # Prefer the binary sibling the extractor writes alongside the JSON,
+        # unless the JSON has been edited since
+        if msgpack is not None:
+            msgpack_path = filepath.replace('.json', '.msgpack')
+            try:
+                if os.path.getmtime(msgpack_path) >= os.path.getmtime(filepath):
+                    with open(msgpack_path, 'rb') as f:
+                        data = msgpack.unpackb(f.read(), raw=False)
+                    self._json_cache[filename] = data
+                    return data
+            except OSError:
+                pass
+
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
         except FileNotFoundError:
             logger.warning(f"JSON file not found: {filename}")
-            return None
+            data = None
         except Exception as e:
             logger.error(f"Failed to load {filename}: {e}")
             raise
+        self._json_cache[filename] = data
+        return data
 
 class TestSchemaValidation:
     """Pytest test class for schema validation"""
@@ -106,6 +143,14 @@ class TestSchemaValidation:
             
             self.__class__.validator = SchemaValidator(connection_params, json_dir)
             self.__class__.validator.connect()
+
+            # One round trip covers all five existence tests; bucket the rows
+            # by object kind into sets of (schema, name) tuples
+            query = get_query('validation', 'all_existing_objects')
+            existing = defaultdict(set)
+            for row in self.__class__.validator.execute_query(query):
+                existing[row['kind']].add((row['object_schema'], row['object_name']))
+            self.__class__.existing_objects = existing
     
     def test_tables_exist(self):
         """Test that all expected tables exist in dev database"""
@@ -113,16 +158,15 @@ class TestSchemaValidation:
         if not tables_data:
             pytest.skip("No tables.json file found")
         
-        # Get existing tables from dev database
-        query = get_query('validation', 'existing_tables')
-        existing_tables = self.validator.execute_query(query)
-        existing_table_keys = {f"{t['table_schema']}.{t['table_name']}" for t in existing_tables}
-        
+        # Tuple keys avoid one string allocation per row; names are only
+        # formatted for the error message
+        existing_table_keys = self.existing_objects['table']
+
         missing_tables = []
-        for expected_table in tables_data:
-            table_key = f"{expected_table['schema']}.{expected_table['name']}"
-            if table_key not in existing_table_keys:
-                missing_tables.append(table_key)
+        # tables.json is columnar: parallel schemas/tables lists
+        for schema, name in zip(tables_data['schemas'], tables_data['tables']):
+            if (schema, name) not in existing_table_keys:
+                missing_tables.append(f"{schema}.{name}")
         
         assert not missing_tables, f"Missing tables in dev database: {missing_tables}"
     
@@ -132,45 +176,49 @@ class TestSchemaValidation:
         if not tables_data:
             pytest.skip("No tables.json file found")
         
+        # Flatten both sides to {(schema, table, column): (type, nullable)}
+        # so missing columns and mismatches fall out of C-speed set algebra
+        # instead of nested Python loops
+        schemas = tables_data['schemas']
+        table_names = tables_data['tables']
+        cols = tables_data['columns']
+        expected_by_key = {
+            (schemas[idx], table_names[idx], name): (data_type, is_nullable)
+            for idx, name, data_type, is_nullable in zip(
+                cols['table_idx'], cols['name'], cols['data_type'], cols['is_nullable']
+            )
+        }
+
+        query = get_query('validation', 'all_table_columns')
+        actual_by_key = {
+            (c['table_schema'], c['table_name'], c['column_name']): (c['data_type'], c['is_nullable'])
+            for c in self.validator.execute_query(query)
+        }
+
         errors = []
-        
-        for expected_table in tables_data:
-            table_schema = expected_table['schema']
-            table_name = expected_table['name']
-            
-            # Get actual columns from dev database
-            query = get_query('validation', 'table_columns')
-            
-            try:
-                actual_columns = self.validator.execute_query(query)
-                actual_column_dict = {col['column_name']: col for col in actual_columns}
-                
-                for expected_col in expected_table['columns']:
-                    col_name = expected_col['name']
-                    
-                    if col_name not in actual_column_dict:
-                        errors.append(f"Table {table_schema}.{table_name}: Missing column '{col_name}'")
-                        continue
-                    
-                    actual_col = actual_column_dict[col_name]
-                    
-                    # Check data type
-                    if expected_col['data_type'] != actual_col['data_type']:
-                        errors.append(
-                            f"Table {table_schema}.{table_name}, column '{col_name}': "
-                            f"Expected type '{expected_col['data_type']}', got '{actual_col['data_type']}'"
-                        )
-                    
-                    # Check nullable
-                    if expected_col['is_nullable'] != actual_col['is_nullable']:
-                        errors.append(
-                            f"Table {table_schema}.{table_name}, column '{col_name}': "
-                            f"Expected nullable '{expected_col['is_nullable']}', got '{actual_col['is_nullable']}'"
-                        )
-                        
-            except Exception as e:
-                errors.append(f"Error validating table {table_schema}.{table_name}: {str(e)}")
-        
+
+        for table_schema, table_name, col_name in sorted(expected_by_key.keys() - actual_by_key.keys()):
+            errors.append(f"Table {table_schema}.{table_name}: Missing column '{col_name}'")
+
+        for key in sorted(expected_by_key.keys() & actual_by_key.keys()):
+            if expected_by_key[key] == actual_by_key[key]:
+                continue
+            table_schema, table_name, col_name = key
+            expected_type, expected_nullable = expected_by_key[key]
+            actual_type, actual_nullable = actual_by_key[key]
+
+            if expected_type != actual_type:
+                errors.append(
+                    f"Table {table_schema}.{table_name}, column '{col_name}': "
+                    f"Expected type '{expected_type}', got '{actual_type}'"
+                )
+
+            if expected_nullable != actual_nullable:
+                errors.append(
+                    f"Table {table_schema}.{table_name}, column '{col_name}': "
+                    f"Expected nullable '{expected_nullable}', got '{actual_nullable}'"
+                )
+
         assert not errors, f"Column validation errors: {errors}"
     
     def test_views_exist(self):
@@ -179,15 +227,12 @@ class TestSchemaValidation:
         if not views_data:
             pytest.skip("No views.json file found")
         
-        query = get_query('validation', 'existing_views')
-        existing_views = self.validator.execute_query(query)
-        existing_view_keys = {f"{v['table_schema']}.{v['table_name']}" for v in existing_views}
-        
+        existing_view_keys = self.existing_objects['view']
+
         missing_views = []
         for expected_view in views_data:
-            view_key = f"{expected_view['schema']}.{expected_view['name']}"
-            if view_key not in existing_view_keys:
-                missing_views.append(view_key)
+            if (expected_view['schema'], expected_view['name']) not in existing_view_keys:
+                missing_views.append(f"{expected_view['schema']}.{expected_view['name']}")
         
         assert not missing_views, f"Missing views in dev database: {missing_views}"
     
@@ -197,15 +242,12 @@ class TestSchemaValidation:
         if not functions_data:
             pytest.skip("No functions.json file found")
         
-        query = get_query('validation', 'existing_functions')
-        existing_functions = self.validator.execute_query(query)
-        existing_func_keys = {f"{f['schema_name']}.{f['function_name']}" for f in existing_functions}
-        
+        existing_func_keys = self.existing_objects['function']
+
         missing_functions = []
         for expected_func in functions_data:
-            func_key = f"{expected_func['schema_name']}.{expected_func['function_name']}"
-            if func_key not in existing_func_keys:
-                missing_functions.append(func_key)
+            if (expected_func['schema_name'], expected_func['function_name']) not in existing_func_keys:
+                missing_functions.append(f"{expected_func['schema_name']}.{expected_func['function_name']}")
         
         assert not missing_functions, f"Missing functions in dev database: {missing_functions}"
     
@@ -215,15 +257,12 @@ class TestSchemaValidation:
         if not indexes_data:
             pytest.skip("No indexes.json file found")
         
-        query = get_query('validation', 'existing_indexes')
-        existing_indexes = self.validator.execute_query(query)
-        existing_index_keys = {f"{i['schemaname']}.{i['indexname']}" for i in existing_indexes}
-        
+        existing_index_keys = self.existing_objects['index']
+
         missing_indexes = []
         for expected_idx in indexes_data:
-            idx_key = f"{expected_idx['schemaname']}.{expected_idx['indexname']}"
-            if idx_key not in existing_index_keys:
-                missing_indexes.append(idx_key)
+            if (expected_idx['schemaname'], expected_idx['indexname']) not in existing_index_keys:
+                missing_indexes.append(f"{expected_idx['schemaname']}.{expected_idx['indexname']}")
         
         assert not missing_indexes, f"Missing indexes in dev database: {missing_indexes}"
     
@@ -233,22 +272,16 @@ class TestSchemaValidation:
         if not sequences_data:
             pytest.skip("No sequences.json file found")
         
-        query = get_query('validation', 'existing_sequences')
-        existing_sequences = self.validator.execute_query(query)
-        existing_seq_keys = {f"{s['sequence_schema']}.{s['sequence_name']}" for s in existing_sequences}
-        
+        existing_seq_keys = self.existing_objects['sequence']
+
         missing_sequences = []
         for expected_seq in sequences_data:
-            seq_key = f"{expected_seq['sequence_schema']}.{expected_seq['sequence_name']}"
-            if seq_key not in existing_seq_keys:
-                missing_sequences.append(seq_key)
+            if (expected_seq['sequence_schema'], expected_seq['sequence_name']) not in existing_seq_keys:
+                missing_sequences.append(f"{expected_seq['sequence_schema']}.{expected_seq['sequence_name']}")
         
         assert not missing_sequences, f"Missing sequences in dev database: {missing_sequences}"
 
-def generate_html_report(json_report_path: str, html_report_path: str):
-    """Generate HTML report from pytest JSON report"""
-    
-    html_template = """
+_HTML_TEMPLATE_SOURCE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -313,8 +346,13 @@ def generate_html_report(json_report_path: str, html_report_path: str):
     </div>
 </body>
 </html>
-    """
-    
+"""
+
+# Compiled once at import; autoescape also covers failure text like longrepr
+_HTML_TEMPLATE = Environment(autoescape=True).from_string(_HTML_TEMPLATE_SOURCE)
+
+def generate_html_report(json_report_path: str, html_report_path: str):
+    """Generate HTML report from pytest JSON report"""
     try:
         # Load pytest JSON report
         with open(json_report_path, 'r') as f:
@@ -330,8 +368,7 @@ def generate_html_report(json_report_path: str, html_report_path: str):
         total_duration = report_data.get('duration', 0)
         
         # Generate HTML
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = _HTML_TEMPLATE.render(
             report_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             database_info=os.getenv('DB_NAME', 'Unknown'),
             passed_count=passed_count,
@@ -382,6 +419,9 @@ def main():
     pytest_args = [
         __file__,
         '-v',
+        # pytest-xdist: the tests are independent I/O-bound queries, and
+        # each worker process builds its own pooled validator
+        '-n', 'auto',
         f'--json-report',
         f'--json-report-file={json_report_path}',
         '--tb=short'
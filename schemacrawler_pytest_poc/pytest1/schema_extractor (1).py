@@ -7,13 +7,25 @@ for tables, views, functions, procedures, etc.
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 import argparse
 import logging
-from sql_queries import get_query
+from sql_queries import get_query_bytes
+
+try:
+    import orjson  # C-implemented, ~10x faster than stdlib json
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # compact binary sidecar for the validator's fast path
+except ImportError:
+    msgpack = None
 
 # Configure logging
 logging.basicConfig(
@@ -26,128 +38,152 @@ class SchemaExtractor:
     def __init__(self, connection_params: Dict[str, str], output_dir: str = "schema_json"):
         self.connection_params = connection_params
         self.output_dir = output_dir
-        self.connection = None
-        
+        self.pool = None
+
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
-        
+
     def connect(self):
-        """Establish database connection"""
+        """Establish database connection pool"""
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            self.pool = ThreadedConnectionPool(1, 6, **self.connection_params)
             logger.info("Connected to database successfully")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
-    
+
     def disconnect(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            logger.info("Database connection closed")
-    
-    def execute_query(self, query: str) -> List[Dict]:
-        """Execute query and return results as list of dictionaries"""
+        """Close database connections"""
+        if self.pool:
+            self.pool.closeall()
+            logger.info("Database connections closed")
+
+    def execute_query(self, query: bytes, row_type: str = 'dict') -> List:
+        """Execute a pre-encoded query and return results.
+
+        psycopg2 takes the bytes form as-is, skipping the per-execute
+        UTF-8 encode of the statement text.
+
+        row_type 'dict' builds one dict per row; 'tuple' returns plain
+        tuples in the query's column order, skipping a dict plus one
+        key-string reference per column on every row - noticeably cheaper
+        on the wide table/view result sets.
+        """
+        connection = self.pool.getconn()
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            factory = RealDictCursor if row_type == 'dict' else None
+            # Named cursor streams rows via DECLARE/FETCH in itersize chunks
+            # instead of buffering the whole result set client-side
+            with connection.cursor(name='extract_cursor', cursor_factory=factory) as cursor:
+                cursor.itersize = 2000
                 cursor.execute(query)
-                return [dict(row) for row in cursor.fetchall()]
+                if row_type == 'dict':
+                    return [dict(row) for row in cursor]
+                return list(cursor)
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise
+        finally:
+            self.pool.putconn(connection)
     
-    def extract_tables(self) -> List[Dict]:
-        """Extract table information"""
-        query = get_query('extraction', 'tables')
-        
-        results = self.execute_query(query)
-        tables = {}
-        
-        for row in results:
-            table_key = f"{row['table_schema']}.{row['table_name']}"
-            
-            if table_key not in tables:
-                tables[table_key] = {
-                    'schema': row['table_schema'],
-                    'name': row['table_name'],
-                    'type': row['table_type'],
-                    'columns': [],
-                    'constraints': []
-                }
-            
-            if row['column_name']:
-                column_info = {
-                    'name': row['column_name'],
-                    'position': row['ordinal_position'],
-                    'data_type': row['data_type'],
-                    'is_nullable': row['is_nullable'],
-                    'default': row['column_default'],
-                    'max_length': row['character_maximum_length'],
-                    'numeric_precision': row['numeric_precision'],
-                    'numeric_scale': row['numeric_scale']
-                }
-                
-                # Avoid duplicate columns
-                if not any(col['name'] == column_info['name'] for col in tables[table_key]['columns']):
-                    tables[table_key]['columns'].append(column_info)
-            
-            if row['constraint_name'] and row['constraint_type']:
-                constraint_info = {
-                    'name': row['constraint_name'],
-                    'type': row['constraint_type']
-                }
-                # Avoid duplicate constraints
-                if constraint_info not in tables[table_key]['constraints']:
-                    tables[table_key]['constraints'].append(constraint_info)
-        
-        return list(tables.values())
+    def extract_tables(self) -> Dict:
+        """Extract table information in columnar (struct-of-arrays) form.
+
+        The result holds parallel per-table lists plus columnar blocks for
+        columns and constraints referencing their table by index. Repeated
+        JSON keys disappear from the file and the validator can rebuild its
+        lookup maps with single zip passes.
+        """
+        table_index = {}
+        schemas, names, types = [], [], []
+        columns = {
+            'table_idx': [], 'name': [], 'position': [], 'data_type': [],
+            'is_nullable': [], 'default': [], 'max_length': [],
+            'numeric_precision': [], 'numeric_scale': []
+        }
+        constraints = {'table_idx': [], 'name': [], 'type': []}
+        seen_columns = set()
+        seen_constraints = set()
+
+        # One row per column from pg_catalog - no dedupe pass needed.
+        # Tuple rows in the query's column order avoid a dict per row.
+        for (table_schema, table_name, table_type, column_name, ordinal_position,
+             column_default, is_nullable, data_type, max_length,
+             numeric_precision, numeric_scale) in self.execute_query(
+                get_query_bytes('extraction', 'tables'), row_type='tuple'):
+            table_key = (table_schema, table_name)
+            idx = table_index.get(table_key)
+            if idx is None:
+                idx = table_index[table_key] = len(schemas)
+                schemas.append(table_schema)
+                names.append(table_name)
+                types.append(table_type)
+
+            if column_name and (idx, column_name) not in seen_columns:
+                seen_columns.add((idx, column_name))
+                columns['table_idx'].append(idx)
+                columns['name'].append(column_name)
+                columns['position'].append(ordinal_position)
+                columns['data_type'].append(data_type)
+                columns['is_nullable'].append(is_nullable)
+                columns['default'].append(column_default)
+                columns['max_length'].append(max_length)
+                columns['numeric_precision'].append(numeric_precision)
+                columns['numeric_scale'].append(numeric_scale)
+
+        # Constraints come from a second, already-distinct query
+        for table_schema, table_name, constraint_name, constraint_type in self.execute_query(
+                get_query_bytes('extraction', 'table_constraints'), row_type='tuple'):
+            idx = table_index.get((table_schema, table_name))
+            if idx is None:
+                continue
+            constraint_key = (idx, constraint_name, constraint_type)
+            if constraint_key not in seen_constraints:
+                seen_constraints.add(constraint_key)
+                constraints['table_idx'].append(idx)
+                constraints['name'].append(constraint_name)
+                constraints['type'].append(constraint_type)
+
+        return {
+            'schemas': schemas,
+            'tables': names,
+            'types': types,
+            'columns': columns,
+            'constraints': constraints
+        }
     
     def extract_views(self) -> List[Dict]:
         """Extract view information"""
-        query = get_query('extraction', 'views')
-        
-        results = self.execute_query(query)
-        views = {}
-        
-        for row in results:
-            view_key = f"{row['table_schema']}.{row['view_name']}"
-            
-            if view_key not in views:
-                views[view_key] = {
-                    'schema': row['table_schema'],
-                    'name': row['view_name'],
-                    'definition': row['view_definition'],
-                    'columns': []
-                }
-            
-            if row['column_name']:
-                column_info = {
-                    'name': row['column_name'],
-                    'position': row['ordinal_position'],
-                    'data_type': row['data_type'],
-                    'is_nullable': row['is_nullable']
-                }
-                views[view_key]['columns'].append(column_info)
-        
-        return list(views.values())
+        # Columns arrive pre-aggregated as jsonb (psycopg2 decodes them to
+        # Python lists), so this is a plain row-to-dict mapping
+        return [
+            {
+                'schema': table_schema,
+                'name': view_name,
+                'definition': view_definition,
+                'columns': columns or []
+            }
+            for table_schema, view_name, view_definition, columns in self.execute_query(
+                get_query_bytes('extraction', 'views'), row_type='tuple')
+        ]
     
     def extract_functions(self) -> List[Dict]:
         """Extract function/procedure information"""
-        query = get_query('extraction', 'functions')
+        query = get_query_bytes('extraction', 'functions')
         
         results = self.execute_query(query)
         return results
     
     def extract_indexes(self) -> List[Dict]:
         """Extract index information"""
-        query = get_query('extraction', 'indexes')
+        query = get_query_bytes('extraction', 'indexes')
         
         results = self.execute_query(query)
         return results
     
     def extract_sequences(self) -> List[Dict]:
         """Extract sequence information"""
-        query = get_query('extraction', 'sequences')
+        query = get_query_bytes('extraction', 'sequences')
         
         results = self.execute_query(query)
         return results
@@ -156,8 +192,20 @@ class SchemaExtractor:
         """Save data to JSON file"""
         filepath = os.path.join(self.output_dir, filename)
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str)
+            if orjson is not None:
+                # No default callback: orjson serializes datetimes natively
+                # and the extraction payloads are otherwise JSON-native, so
+                # the per-object fallback dispatch never runs
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, default=str)
+            if msgpack is not None:
+                # Binary sibling: 3-5x smaller and much faster to parse; the
+                # JSON stays authoritative and human-readable
+                with open(filepath.replace('.json', '.msgpack'), 'wb') as f:
+                    f.write(msgpack.packb(data, use_bin_type=True, default=str))
             logger.info(f"Saved {filename} with {len(data) if isinstance(data, list) else 1} records")
         except Exception as e:
             logger.error(f"Failed to save {filename}: {e}")
@@ -178,32 +226,27 @@ class SchemaExtractor:
                 }
             }
             self.save_to_json(metadata, 'metadata.json')
-            
-            # Extract tables
-            logger.info("Extracting tables...")
-            tables = self.extract_tables()
-            self.save_to_json(tables, 'tables.json')
-            
-            # Extract views
-            logger.info("Extracting views...")
-            views = self.extract_views()
-            self.save_to_json(views, 'views.json')
-            
-            # Extract functions/procedures
-            logger.info("Extracting functions...")
-            functions = self.extract_functions()
-            self.save_to_json(functions, 'functions.json')
-            
-            # Extract indexes
-            logger.info("Extracting indexes...")
-            indexes = self.extract_indexes()
-            self.save_to_json(indexes, 'indexes.json')
-            
-            # Extract sequences
-            logger.info("Extracting sequences...")
-            sequences = self.extract_sequences()
-            self.save_to_json(sequences, 'sequences.json')
-            
+
+            # The five extractions are independent read-only queries; run them
+            # concurrently on pooled connections so wall time is bounded by the
+            # slowest query instead of the sum
+            extractions = [
+                ('tables', self.extract_tables, 'tables.json'),
+                ('views', self.extract_views, 'views.json'),
+                ('functions', self.extract_functions, 'functions.json'),
+                ('indexes', self.extract_indexes, 'indexes.json'),
+                ('sequences', self.extract_sequences, 'sequences.json')
+            ]
+            # Each worker also writes its own JSON, so disk writes overlap
+            # the other workers' still-running queries
+            def extract_and_save(job):
+                name, extract, filename = job
+                logger.info(f"Extracting {name}...")
+                self.save_to_json(extract(), filename)
+
+            with ThreadPoolExecutor(max_workers=len(extractions)) as executor:
+                list(executor.map(extract_and_save, extractions))
+
             logger.info(f"Schema extraction completed. Files saved to: {self.output_dir}")
             
         except Exception as e:
@@ -4,60 +4,97 @@ SQL Queries Helper - Contains all SQL queries for database schema extraction
 Separated from main logic for better maintainability and testing
 """
 
+
 class SchemaQueries:
     """Collection of SQL queries for extracting database schema information"""
     
     @staticmethod
     def get_tables_query():
-        """SQL query to extract table information with columns and constraints"""
+        """SQL query to extract table and column information from pg_catalog
+
+        Reads pg_class/pg_attribute directly instead of the information_schema
+        views: one row per column, no Cartesian product with constraints.
+        """
         return """
-        SELECT 
-            t.table_schema,
-            t.table_name,
-            t.table_type,
-            c.column_name,
-            c.ordinal_position,
-            c.column_default,
-            c.is_nullable,
-            c.data_type,
-            c.character_maximum_length,
-            c.numeric_precision,
-            c.numeric_scale,
-            tc.constraint_name,
-            tc.constraint_type
-        FROM information_schema.tables t
-        LEFT JOIN information_schema.columns c 
-            ON t.table_name = c.table_name 
-            AND t.table_schema = c.table_schema
-        LEFT JOIN information_schema.key_column_usage kcu 
-            ON c.table_name = kcu.table_name 
-            AND c.column_name = kcu.column_name 
-            AND c.table_schema = kcu.table_schema
-        LEFT JOIN information_schema.table_constraints tc 
-            ON kcu.constraint_name = tc.constraint_name 
-            AND kcu.table_schema = tc.table_schema
-        WHERE t.table_schema NOT IN ('information_schema', 'pg_catalog')
-        ORDER BY t.table_schema, t.table_name, c.ordinal_position;
+        SELECT
+            n.nspname as table_schema,
+            c.relname as table_name,
+            CASE c.relkind WHEN 'p' THEN 'PARTITIONED TABLE' ELSE 'BASE TABLE' END as table_type,
+            a.attname as column_name,
+            a.attnum as ordinal_position,
+            pg_catalog.pg_get_expr(ad.adbin, ad.adrelid) as column_default,
+            CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END as is_nullable,
+            pg_catalog.format_type(a.atttypid, a.atttypmod) as data_type,
+            information_schema._pg_char_max_length(a.atttypid, a.atttypmod) as character_maximum_length,
+            information_schema._pg_numeric_precision(a.atttypid, a.atttypmod) as numeric_precision,
+            information_schema._pg_numeric_scale(a.atttypid, a.atttypmod) as numeric_scale
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_catalog.pg_attribute a
+            ON a.attrelid = c.oid
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+        LEFT JOIN pg_catalog.pg_attrdef ad
+            ON ad.adrelid = a.attrelid
+            AND ad.adnum = a.attnum
+        WHERE c.relkind IN ('r', 'p')
+        AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+        AND n.nspname !~ '^pg_'
+        ORDER BY n.nspname, c.relname;
+        """
+
+    @staticmethod
+    def get_table_constraints_query():
+        """SQL query to extract table constraints from pg_catalog"""
+        return """
+        SELECT
+            n.nspname as table_schema,
+            c.relname as table_name,
+            con.conname as constraint_name,
+            CASE con.contype
+                WHEN 'p' THEN 'PRIMARY KEY'
+                WHEN 'f' THEN 'FOREIGN KEY'
+                WHEN 'u' THEN 'UNIQUE'
+                WHEN 'c' THEN 'CHECK'
+                WHEN 'x' THEN 'EXCLUDE'
+                ELSE con.contype::text
+            END as constraint_type
+        FROM pg_catalog.pg_constraint con
+        JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p')
+        AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+        AND n.nspname !~ '^pg_'
+        ORDER BY n.nspname, c.relname, con.conname;
         """
     
     @staticmethod
     def get_views_query():
-        """SQL query to extract view information with columns"""
+        """SQL query to extract view information with columns
+
+        Columns are pre-aggregated server-side as jsonb: one row per view
+        instead of one per column, so the (often multi-KB) view_definition
+        crosses the wire exactly once.
+        """
         return """
-        SELECT 
+        SELECT
             v.table_schema,
             v.table_name as view_name,
             v.view_definition,
-            c.column_name,
-            c.ordinal_position,
-            c.data_type,
-            c.is_nullable
+            (
+                SELECT jsonb_agg(jsonb_build_object(
+                           'name', c.column_name,
+                           'position', c.ordinal_position,
+                           'data_type', c.data_type,
+                           'is_nullable', c.is_nullable
+                       ) ORDER BY c.ordinal_position)
+                FROM information_schema.columns c
+                WHERE c.table_schema = v.table_schema
+                AND c.table_name = v.table_name
+            ) as columns
         FROM information_schema.views v
-        LEFT JOIN information_schema.columns c 
-            ON v.table_name = c.table_name 
-            AND v.table_schema = c.table_schema
         WHERE v.table_schema NOT IN ('information_schema', 'pg_catalog')
-        ORDER BY v.table_schema, v.table_name, c.ordinal_position;
+        ORDER BY v.table_schema, v.table_name;
         """
     
     @staticmethod
@@ -268,14 +305,27 @@ class ValidationQueries:
     
     @staticmethod
     def get_table_columns_query():
-        """SQL query to get columns for a specific table"""
+        """SQL query to get columns for a specific table
+
+        Bind with a dict: {'schema': ..., 'table': ...}
+        """
         return """
         SELECT column_name, data_type, is_nullable, column_default
-        FROM information_schema.columns 
-        WHERE table_schema = %s AND table_name = %s
+        FROM information_schema.columns
+        WHERE table_schema = %(schema)s AND table_name = %(table)s
         ORDER BY ordinal_position;
         """
     
+    @staticmethod
+    def get_all_table_columns_query():
+        """SQL query to get columns for every user table in one round trip"""
+        return """
+        SELECT table_schema, table_name, column_name, data_type, is_nullable
+        FROM information_schema.columns
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        ORDER BY table_schema, table_name, ordinal_position;
+        """
+
     @staticmethod
     def get_existing_views_query():
         """SQL query to get existing views in target database"""
@@ -317,6 +367,32 @@ class ValidationQueries:
         ORDER BY sequence_schema, sequence_name;
         """
     
+    @staticmethod
+    def get_all_existing_objects_query():
+        """SQL query listing all tables/views/functions/indexes/sequences at once"""
+        return """
+        SELECT 'table' as kind, table_schema as object_schema, table_name as object_name
+        FROM information_schema.tables
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        UNION ALL
+        SELECT 'view', table_schema, table_name
+        FROM information_schema.views
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        UNION ALL
+        SELECT 'function', n.nspname, p.proname
+        FROM pg_catalog.pg_proc p
+        LEFT JOIN pg_catalog.pg_namespace n ON n.oid = p.pronamespace
+        WHERE n.nspname NOT IN ('information_schema', 'pg_catalog')
+        UNION ALL
+        SELECT 'index', schemaname, indexname
+        FROM pg_indexes
+        WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
+        UNION ALL
+        SELECT 'sequence', sequence_schema, sequence_name
+        FROM information_schema.sequences
+        WHERE sequence_schema NOT IN ('information_schema', 'pg_catalog');
+        """
+
     @staticmethod
     def get_existing_triggers_query():
         """SQL query to get existing triggers in target database"""
@@ -340,6 +416,7 @@ class ValidationQueries:
 # Query categories for organized access
 EXTRACTION_QUERIES = {
     'tables': SchemaQueries.get_tables_query,
+    'table_constraints': SchemaQueries.get_table_constraints_query,
     'views': SchemaQueries.get_views_query,
     'functions': SchemaQueries.get_functions_query,
     'indexes': SchemaQueries.get_indexes_query,
@@ -356,42 +433,61 @@ EXTRACTION_QUERIES = {
 VALIDATION_QUERIES = {
     'existing_tables': ValidationQueries.get_existing_tables_query,
     'table_columns': ValidationQueries.get_table_columns_query,
+    'all_table_columns': ValidationQueries.get_all_table_columns_query,
     'existing_views': ValidationQueries.get_existing_views_query,
     'existing_functions': ValidationQueries.get_existing_functions_query,
     'existing_indexes': ValidationQueries.get_existing_indexes_query,
     'existing_sequences': ValidationQueries.get_existing_sequences_query,
+    'all_existing_objects': ValidationQueries.get_all_existing_objects_query,
     'existing_triggers': ValidationQueries.get_existing_triggers_query,
     'existing_constraints': ValidationQueries.get_existing_constraints_query
 }
 
+# Materialize every query string once at import time; get_query becomes a
+# pure dict lookup instead of a staticmethod call rebuilding the SQL text
+_EXTRACTION_SQL = {name: fn() for name, fn in EXTRACTION_QUERIES.items()}
+_VALIDATION_SQL = {name: fn() for name, fn in VALIDATION_QUERIES.items()}
+_SQL_BY_CATEGORY = {'extraction': _EXTRACTION_SQL, 'validation': _VALIDATION_SQL}
+
+# Pre-encoded variants: psycopg2 accepts bytes queries directly, which
+# skips one UTF-8 encode on every cursor.execute of the same statement
+_EXTRACTION_SQL_BYTES = {name: sql.encode('utf-8') for name, sql in _EXTRACTION_SQL.items()}
+_VALIDATION_SQL_BYTES = {name: sql.encode('utf-8') for name, sql in _VALIDATION_SQL.items()}
+_SQL_BYTES_BY_CATEGORY = {'extraction': _EXTRACTION_SQL_BYTES, 'validation': _VALIDATION_SQL_BYTES}
+
 def get_query(category: str, query_name: str) -> str:
     """
     Get a specific query by category and name
-    
+
     Args:
         category: 'extraction' or 'validation'
         query_name: Name of the query
-        
+
     Returns:
         SQL query string
-        
+
     Raises:
         ValueError: If category or query_name not found
     """
-    if category == 'extraction':
-        if query_name in EXTRACTION_QUERIES:
-            return EXTRACTION_QUERIES[query_name]()
-        else:
-            raise ValueError(f"Extraction query '{query_name}' not found. Available: {list(EXTRACTION_QUERIES.keys())}")
-    
-    elif category == 'validation':
-        if query_name in VALIDATION_QUERIES:
-            return VALIDATION_QUERIES[query_name]()
-        else:
-            raise ValueError(f"Validation query '{query_name}' not found. Available: {list(VALIDATION_QUERIES.keys())}")
-    
-    else:
+    try:
+        queries = _SQL_BY_CATEGORY[category]
+    except KeyError:
+        raise ValueError(f"Invalid category '{category}'. Use 'extraction' or 'validation'")
+    try:
+        return queries[query_name]
+    except KeyError:
+        raise ValueError(f"{category.capitalize()} query '{query_name}' not found. Available: {list(queries.keys())}")
+
+def get_query_bytes(category: str, query_name: str) -> bytes:
+    """UTF-8 pre-encoded variant of get_query for psycopg2 execute calls"""
+    try:
+        queries = _SQL_BYTES_BY_CATEGORY[category]
+    except KeyError:
         raise ValueError(f"Invalid category '{category}'. Use 'extraction' or 'validation'")
+    try:
+        return queries[query_name]
+    except KeyError:
+        raise ValueError(f"{category.capitalize()} query '{query_name}' not found. Available: {list(queries.keys())}")
 
 def list_available_queries():
     """List all available queries by category"""
